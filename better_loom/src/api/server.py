@@ -71,6 +71,21 @@ app.add_middleware(
 # GZIP compression for faster API responses (30-40% smaller)
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+
+@app.on_event("startup")
+def prewarm_voice_client():
+    """Open the ElevenLabs connection before the first voice request needs it."""
+    from ..voice import prewarm
+    prewarm()
+
+
+@app.on_event("shutdown")
+async def shutdown_vision_client():
+    """Close the shared Vision client's gRPC channels."""
+    from ..vision import close_vision_client
+    await close_vision_client()
+
+
 # Storage paths
 UPLOAD_DIR = Path(tempfile.gettempdir()) / "soron" / "uploads"
 OUTPUT_DIR = Path(tempfile.gettempdir()) / "soron" / "outputs"
@@ -536,10 +551,10 @@ def _run_transcription_for_cache(video_id: str, video_path: Path):
 def _run_analysis_for_cache(video_id: str, video_path: Path):
     """Run vision analysis and cache result."""
     try:
-        from ..vision import GoogleVisionClient
+        from ..vision import get_vision_client
 
         logger.info(f"[{video_id}] Starting vision analysis...")
-        client = GoogleVisionClient()
+        client = get_vision_client()
         # Use 2-second intervals for faster processing
         frames = client.analyze_video_frames(video_path, interval_seconds=2.0)
 
@@ -772,10 +787,10 @@ async def analyze_video(video_id: str, interval: float = 2.0):
     video_path = Path(video["path"])
 
     try:
-        from ..vision import GoogleVisionClient
+        from ..vision import get_vision_client
 
-        client = GoogleVisionClient()
-        analyses = client.analyze_video_frames(video_path, interval_seconds=interval)
+        client = get_vision_client()
+        analyses = await client.analyze_video_frames_async(video_path, interval_seconds=interval)
 
         # Convert to response format
         frames = []
@@ -908,9 +923,9 @@ def _run_transcription_sync(video_id: str, video_path: Path) -> dict:
 
 def _run_analysis_sync(video_id: str, video_path: Path, interval: float) -> dict:
     """Synchronous vision analysis for thread pool execution."""
-    from ..vision import GoogleVisionClient
+    from ..vision import get_vision_client
 
-    client = GoogleVisionClient()
+    client = get_vision_client()
     analyses = client.analyze_video_frames(video_path, interval_seconds=interval)
 
     # Convert to serializable format
@@ -1055,8 +1070,8 @@ async def list_voices():
             return _voices_cache
 
     try:
-        from ..voice import VoiceClient
-        client = VoiceClient()
+        from ..voice import get_voice_client
+        client = get_voice_client()
         voices = client.list_voices()
 
         # Update cache
@@ -1098,7 +1113,7 @@ async def clone_voice(
         logger.info(f"Using main video for voice cloning: {video_path.name}")
 
     try:
-        from ..voice import VoiceClient
+        from ..voice import get_voice_client
         import subprocess
         import re
 
@@ -1179,7 +1194,7 @@ async def clone_voice(
         logger.info(f"Extracted audio: {audio_path} ({audio_path.stat().st_size} bytes), starting at {speech_start:.2f}s")
 
         # Clone voice using selected method (PVC for Pro, IVC for Instant)
-        client = VoiceClient()
+        client = get_voice_client()
         clone_method = method.lower() if method.lower() in ["pvc", "ivc"] else "pvc"
         logger.info(f"Cloning voice using {clone_method.upper()} method")
         voice_id = client.clone_voice(name, [str(audio_path)], method=clone_method)
@@ -1205,9 +1220,9 @@ async def generate_voice(
 ):
     """Generate speech from text."""
     try:
-        from ..voice import VoiceClient
+        from ..voice import get_voice_client
 
-        client = VoiceClient()
+        client = get_voice_client()
 
         # Generate audio
         audio_id = str(uuid.uuid4())[:8]
@@ -2282,8 +2297,8 @@ async def process_lipsync_job(
             urllib.request.urlretrieve(request.audio_url, audio_path)
         elif request.text and request.voice_id:
             # Generate audio from text
-            from ..voice import VoiceClient
-            client = VoiceClient()
+            from ..voice import get_voice_client
+            client = get_voice_client()
             audio_path = OUTPUT_DIR / f"lipsync_audio_{job_id}.wav"
             _, _ = client.generate(
                 text=request.text,
@@ -2634,11 +2649,11 @@ async def process_full_personalization(
             logger.info(f"Processing {len(request.voice_edits)} voice edits")
             jobs_store[job_id]["progress"] = 10
 
-            from ..voice import VoiceClient
+            from ..voice import get_voice_client
             from ..lipsync.engine import LipSyncEngine
             from ..compose.composer import compose_personalized_video
 
-            voice_client = VoiceClient()
+            voice_client = get_voice_client()
 
             # Use Sync Labs for lip-sync
             lipsync_engine = LipSyncEngine(backend="synclabs")
@@ -3343,7 +3358,6 @@ async def process_full_personalization(
             from ..models import VisualSegment, SegmentType
 
             replacer = VisualReplacer()
-            tracker = MotionTracker()
 
             segments = []
             assets = {}
@@ -3353,101 +3367,103 @@ async def process_full_personalization(
             frame_height = info.height
             fps = info.fps
 
-            for i, repl in enumerate(request.visual_replacements):
-                segment_id = f"visual_{i}"
+            # Release the tracker's cached captures even if a replacement fails
+            with MotionTracker() as tracker:
+                for i, repl in enumerate(request.visual_replacements):
+                    segment_id = f"visual_{i}"
 
-                # ================================================================
-                # TIMESTAMP REMAPPING: Convert original timestamps to new timeline
-                # This is CRITICAL when segment processing (split/trim/delete) was applied
-                # ================================================================
-                repl_start = repl.start_time
-                repl_end = repl.end_time
-                if segment_time_mapping:
-                    mapped_range = map_original_range_to_new(repl.start_time, repl.end_time)
-                    if mapped_range is None:
-                        logger.warning(f"Visual replacement {i} at {repl.start_time:.2f}-{repl.end_time:.2f} falls in trimmed region, skipping")
-                        continue
-                    repl_start, repl_end = mapped_range
-                    logger.info(f"[SEGMENTS] Remapped visual replacement: {repl.start_time:.2f}-{repl.end_time:.2f} -> {repl_start:.2f}-{repl_end:.2f}")
-
-                # Convert percentage (0-100) to normalized (0-1) and clamp to valid range
-                bbox = BoundingBox(
-                    x=max(0, min(1, repl.x / 100)),
-                    y=max(0, min(1, repl.y / 100)),
-                    width=max(0.001, min(1, repl.width / 100)),  # Min width to avoid zero-size
-                    height=max(0.001, min(1, repl.height / 100)),  # Min height to avoid zero-size
-                )
-                # Ensure box doesn't extend beyond frame bounds
-                bbox = bbox.clamp()
-
-                # Track if requested (use REMAPPED timestamps)
-                tracking_ref = None
-                if repl.enable_tracking:
-                    logger.info(f"Tracking visual element {i}")
-                    start_frame = int(repl_start * fps)
-                    end_frame = int(repl_end * fps)
-
-                    tracked = tracker.track_region(
-                        video_path=current_video,
-                        initial_bbox=bbox,
-                        start_frame=start_frame,
-                        end_frame=end_frame,
-                    )
-                    tracking_data[segment_id] = tracked
-                    tracking_ref = start_frame
-
-                segment = VisualSegment(
-                    id=segment_id,
-                    segment_type=SegmentType.TEXT if repl.replacement_type == "text" else SegmentType.IMAGE,
-                    start_time=repl_start,  # Remapped timestamp
-                    end_time=repl_end,  # Remapped timestamp
-                    x=bbox.x,
-                    y=bbox.y,
-                    width=bbox.width,
-                    height=bbox.height,
-                    placeholder_key=segment_id,
-                    tracking_reference_frame=tracking_ref,
-                )
-                segments.append(segment)
-
-                # Create asset
-                pixel_width = int(bbox.width * frame_width)
-                pixel_height = int(bbox.height * frame_height)
-
-                if repl.replacement_type == "text":
-                    asset = replacer.create_text_asset(
-                        text=repl.replacement_value,
-                        width=pixel_width,
-                        height=pixel_height,
-                        font_size=max(16, pixel_height - 8),
-                        color=(255, 255, 255),
-                        bg_color=(0, 0, 0),
+                    # ================================================================
+                    # TIMESTAMP REMAPPING: Convert original timestamps to new timeline
+                    # This is CRITICAL when segment processing (split/trim/delete) was applied
+                    # ================================================================
+                    repl_start = repl.start_time
+                    repl_end = repl.end_time
+                    if segment_time_mapping:
+                        mapped_range = map_original_range_to_new(repl.start_time, repl.end_time)
+                        if mapped_range is None:
+                            logger.warning(f"Visual replacement {i} at {repl.start_time:.2f}-{repl.end_time:.2f} falls in trimmed region, skipping")
+                            continue
+                        repl_start, repl_end = mapped_range
+                        logger.info(f"[SEGMENTS] Remapped visual replacement: {repl.start_time:.2f}-{repl.end_time:.2f} -> {repl_start:.2f}-{repl_end:.2f}")
+
+                    # Convert percentage (0-100) to normalized (0-1) and clamp to valid range
+                    bbox = BoundingBox(
+                        x=max(0, min(1, repl.x / 100)),
+                        y=max(0, min(1, repl.y / 100)),
+                        width=max(0.001, min(1, repl.width / 100)),  # Min width to avoid zero-size
+                        height=max(0.001, min(1, repl.height / 100)),  # Min height to avoid zero-size
                     )
-                elif repl.replacement_type == "blur":
-                    # Create blur mask (solid gray)
-                    import numpy as np
-                    blur_img = np.zeros((pixel_height, pixel_width, 4), dtype=np.uint8)
-                    blur_img[:, :, :3] = 128  # Gray
-                    blur_img[:, :, 3] = 180  # Semi-transparent
-                    from ..visual.replacer import ReplacementAsset
-                    asset = ReplacementAsset(image=blur_img, width=pixel_width, height=pixel_height)
-                elif repl.replacement_type == "remove":
-                    # Create transparent overlay (will be filled by inpainting or blur)
-                    import numpy as np
-                    remove_img = np.zeros((pixel_height, pixel_width, 4), dtype=np.uint8)
-                    remove_img[:, :, :3] = 0
-                    remove_img[:, :, 3] = 200  # Almost opaque black
-                    from ..visual.replacer import ReplacementAsset
-                    asset = ReplacementAsset(image=remove_img, width=pixel_width, height=pixel_height)
-                else:
-                    # Image replacement - load from URL or path
-                    asset = replacer.load_image_asset(
-                        image_path=repl.replacement_value,
-                        target_width=pixel_width,
-                        target_height=pixel_height,
+                    # Ensure box doesn't extend beyond frame bounds
+                    bbox = bbox.clamp()
+
+                    # Track if requested (use REMAPPED timestamps)
+                    tracking_ref = None
+                    if repl.enable_tracking:
+                        logger.info(f"Tracking visual element {i}")
+                        start_frame = int(repl_start * fps)
+                        end_frame = int(repl_end * fps)
+
+                        tracked = tracker.track_region(
+                            video_path=current_video,
+                            initial_bbox=bbox,
+                            start_frame=start_frame,
+                            end_frame=end_frame,
+                        )
+                        tracking_data[segment_id] = tracked
+                        tracking_ref = start_frame
+
+                    segment = VisualSegment(
+                        id=segment_id,
+                        segment_type=SegmentType.TEXT if repl.replacement_type == "text" else SegmentType.IMAGE,
+                        start_time=repl_start,  # Remapped timestamp
+                        end_time=repl_end,  # Remapped timestamp
+                        x=bbox.x,
+                        y=bbox.y,
+                        width=bbox.width,
+                        height=bbox.height,
+                        placeholder_key=segment_id,
+                        tracking_reference_frame=tracking_ref,
                     )
+                    segments.append(segment)
+
+                    # Create asset
+                    pixel_width = int(bbox.width * frame_width)
+                    pixel_height = int(bbox.height * frame_height)
+
+                    if repl.replacement_type == "text":
+                        asset = replacer.create_text_asset(
+                            text=repl.replacement_value,
+                            width=pixel_width,
+                            height=pixel_height,
+                            font_size=max(16, pixel_height - 8),
+                            color=(255, 255, 255),
+                            bg_color=(0, 0, 0),
+                        )
+                    elif repl.replacement_type == "blur":
+                        # Create blur mask (solid gray)
+                        import numpy as np
+                        blur_img = np.zeros((pixel_height, pixel_width, 4), dtype=np.uint8)
+                        blur_img[:, :, :3] = 128  # Gray
+                        blur_img[:, :, 3] = 180  # Semi-transparent
+                        from ..visual.replacer import ReplacementAsset
+                        asset = ReplacementAsset(image=blur_img, width=pixel_width, height=pixel_height)
+                    elif repl.replacement_type == "remove":
+                        # Create transparent overlay (will be filled by inpainting or blur)
+                        import numpy as np
+                        remove_img = np.zeros((pixel_height, pixel_width, 4), dtype=np.uint8)
+                        remove_img[:, :, :3] = 0
+                        remove_img[:, :, 3] = 200  # Almost opaque black
+                        from ..visual.replacer import ReplacementAsset
+                        asset = ReplacementAsset(image=remove_img, width=pixel_width, height=pixel_height)
+                    else:
+                        # Image replacement - load from URL or path
+                        asset = replacer.load_image_asset(
+                            image_path=repl.replacement_value,
+                            target_width=pixel_width,
+                            target_height=pixel_height,
+                        )
 
-                assets[segment_id] = asset
+                    assets[segment_id] = asset
 
             jobs_store[job_id]["progress"] = 80
 
@@ -4134,16 +4150,16 @@ async def test_services():
 
     # Test Vision
     try:
-        from ..vision import GoogleVisionClient
-        client = GoogleVisionClient()
+        from ..vision import get_vision_client
+        get_vision_client()
         results["vision"] = "connected"
     except Exception as e:
         results["vision"] = f"error: {e}"
 
     # Test ElevenLabs
     try:
-        from ..voice import VoiceClient
-        client = VoiceClient()
+        from ..voice import get_voice_client
+        client = get_voice_client()
         voices = client.list_voices()
         results["elevenlabs"] = f"connected ({len(voices)} voices)"
     except Exception as e:
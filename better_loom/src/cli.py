@@ -10,13 +10,12 @@ from pathlib import Path
 from loguru import logger
 
 from .models import PersonalizationData, VideoTemplate, VoiceSegment, VisualSegment
-from .pipeline import PersonalizationPipeline
-from .pipeline.jobs import TemplateManager
-from .voice import VoiceClient
 
 
 def cmd_personalize(args):
     """Run a personalization job."""
+    from .pipeline import PersonalizationPipeline
+
     # Load personalization data
     with open(args.data) as f:
         data_dict = json.load(f)
@@ -35,6 +34,8 @@ def cmd_personalize(args):
 
 def cmd_create_template(args):
     """Create a template from a JSON definition."""
+    from .pipeline.jobs import TemplateManager
+
     with open(args.config) as f:
         config = json.load(f)
 
@@ -54,6 +55,8 @@ def cmd_create_template(args):
 
 def cmd_clone_voice(args):
     """Clone a voice from audio samples."""
+    from .voice import VoiceClient
+
     client = VoiceClient()
 
     audio_files = args.audio_files
@@ -5,9 +5,14 @@ All video manipulation goes through here. No frame-by-frame processing.
 Uses FFmpeg's native filters for speed and quality.
 """
 
+import os
 import subprocess
 import tempfile
 import shutil
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional
@@ -16,6 +21,10 @@ from loguru import logger
 from .video_info import get_video_info, get_audio_duration
 
 
+# ioctl request from linux/fs.h: share src's extents with dst, copy-on-write
+_FICLONE = 0x40049409
+
+
 class FFmpegError(Exception):
     """FFmpeg operation failed."""
     pass
@@ -27,7 +36,9 @@ def run_ffmpeg(args: list[str], description: str = "FFmpeg operation") -> str:
 
     Returns stdout on success, raises FFmpegError on failure.
     """
-    cmd = ["ffmpeg", "-y", "-hide_banner"] + args
+    # Only errors reach stderr: no per-frame progress lines or stream
+    # banners to buffer and decode, and a failure's message is the error itself
+    cmd = ["ffmpeg", "-y", "-hide_banner", "-loglevel", "error", "-nostats"] + args
 
     logger.debug(f"Running: {' '.join(cmd)}")
 
@@ -44,6 +55,52 @@ def run_ffmpeg(args: list[str], description: str = "FFmpeg operation") -> str:
     return result.stdout
 
 
+def link_or_copy(src: Path, dst: Path) -> Path:
+    """
+    Materialize src at dst as cheaply as possible.
+
+    Hardlinks when src and dst share a filesystem (O(1), no data copied),
+    otherwise falls back to a regular copy. Callers must treat dst as
+    read-only: writing into a hardlink in place would modify src too, so
+    only use it for internal scratch files the pipeline owns. Anything
+    handed to a caller goes through reflink_or_copy.
+    """
+    src, dst = Path(src), Path(dst)
+    if src.resolve() == dst.resolve():
+        # Unlinking dst would delete src
+        return dst
+    try:
+        dst.unlink(missing_ok=True)
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+    return dst
+
+
+def reflink_or_copy(src: Path, dst: Path) -> Path:
+    """
+    Copy src to dst, as a copy-on-write reflink where the filesystem allows.
+
+    Reflinks (btrfs, XFS, ...) share data blocks until either side is
+    written, so they are O(1) like a hardlink, but dst stays an independent
+    file: writing it in place never touches src. Falls back to a regular
+    copy. Use this rather than link_or_copy for anything handed to a caller.
+    """
+    src, dst = Path(src), Path(dst)
+    if src.resolve() == dst.resolve():
+        return dst
+    if fcntl is not None:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copymode(src, dst)
+            return dst
+        except OSError:
+            pass
+    shutil.copy(src, dst)
+    return dst
+
+
 # Cache hardware encoder availability check
 _hw_encoder: Optional[str] = None  # "videotoolbox", "nvenc", or None
 
@@ -84,6 +141,52 @@ def detect_hardware_encoder() -> Optional[str]:
         return None
 
 
+# Cache CUDA overlay availability check (None = not checked yet)
+_cuda_overlay: Optional[bool] = None
+
+# Codecs NVDEC decodes on every GPU generation that has overlay_cuda
+_NVDEC_CODECS = frozenset({"h264", "hevc", "vp8", "vp9", "mpeg1video", "mpeg2video", "mpeg4", "vc1"})
+
+
+def detect_cuda_overlay(video_codec: Optional[str] = None) -> bool:
+    """
+    Check whether FFmpeg can decode, overlay and encode entirely on an NVIDIA GPU.
+
+    Requires the cuda hwaccel, the overlay_cuda filter and the NVENC encoder.
+    When video_codec is given, it must also be one NVDEC can decode.
+    """
+    if video_codec is not None and video_codec not in _NVDEC_CODECS:
+        return False
+
+    global _cuda_overlay
+    if _cuda_overlay is not None:
+        return _cuda_overlay
+
+    try:
+        hwaccels = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-hwaccels"],
+            capture_output=True,
+            text=True,
+        ).stdout
+        filters = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-filters"],
+            capture_output=True,
+            text=True,
+        ).stdout
+
+        _cuda_overlay = (
+            "cuda" in hwaccels.split()
+            and "overlay_cuda" in filters
+            and detect_hardware_encoder() == "nvenc"
+        )
+        if _cuda_overlay:
+            logger.info("CUDA overlay available - overlays will stay on the GPU")
+    except Exception:
+        _cuda_overlay = False
+
+    return _cuda_overlay
+
+
 def get_cpu_thread_count() -> int:
     """Get optimal thread count for FFmpeg (leave 1-2 cores for system)."""
     import os
@@ -151,6 +254,7 @@ class FFmpegProcessor:
         end_time: float,
         output_path: Path,
         reencode: bool = False,
+        video_only: bool = False,
     ) -> Path:
         """
         Extract a video segment.
@@ -161,6 +265,7 @@ class FFmpegProcessor:
             end_time: End time in seconds
             output_path: Where to save the segment
             reencode: If True, re-encode for frame-accurate cuts
+            video_only: If True, drop the audio stream
 
         Returns:
             Path to extracted segment
@@ -199,6 +304,9 @@ class FFmpegProcessor:
                 str(output_path),
             ]
 
+        if video_only:
+            args.insert(-1, "-an")
+
         run_ffmpeg(args, f"Extract segment {start_time}-{end_time}")
 
         logger.info(f"Extracted segment: {start_time:.2f}s - {end_time:.2f}s")
@@ -309,6 +417,7 @@ class FFmpegProcessor:
         audio_path: Path,
         target_duration: float,
         output_path: Path,
+        current_duration: Optional[float] = None,
     ) -> Path:
         """
         Time-stretch audio to exactly match target duration.
@@ -317,8 +426,12 @@ class FFmpegProcessor:
         Falls back to atempo if rubberband unavailable.
 
         This is CRITICAL for keeping video in sync.
+
+        current_duration skips probing audio_path when the caller already
+        knows its length.
         """
-        current_duration = get_audio_duration(audio_path)
+        if current_duration is None:
+            current_duration = get_audio_duration(audio_path)
 
         if abs(current_duration - target_duration) < 0.05:
             # Close enough, just copy
@@ -722,6 +835,8 @@ class FFmpegProcessor:
         video_path: Path,
         overlays: list[dict],
         output_path: Path,
+        hw_accel: Optional[str] = None,
+        encoding_args: Optional[list[str]] = None,
     ) -> Path:
         """
         Apply multiple overlays in a single pass.
@@ -730,21 +845,54 @@ class FFmpegProcessor:
         - path: Path to PNG image
         - x, y: Position
         - start_time, end_time: Optional timing
+        - raw_size: Optional (width, height) if path holds raw RGBA bytes
 
         This is more efficient than applying overlays one at a time.
+
+        With hw_accel="cuda" (see detect_cuda_overlay), the video is decoded,
+        composited with overlay_cuda and encoded with NVENC without frames
+        leaving the GPU; overlay images are uploaded once as yuva420p.
+        overlay_cuda has no timeline support, so if any overlay is timed
+        the whole pass falls back to the CPU overlay filter.
+
+        encoding_args replaces the default output codec arguments
+        (get_video_encoding_args("balanced") with the audio stream copied).
         """
         if not overlays:
-            shutil.copy(video_path, output_path)
-            return output_path
+            # Never hardlink: the caller may overwrite output_path in place
+            return reflink_or_copy(video_path, output_path)
+
+        use_cuda = hw_accel == "cuda"
+        if use_cuda and any(
+            overlay.get("start_time") is not None or overlay.get("end_time") is not None
+            for overlay in overlays
+        ):
+            logger.debug("Timed overlays need enable=, which overlay_cuda lacks - compositing on the CPU")
+            use_cuda = False
 
         # Build input list
-        inputs = ["-i", str(video_path)]
+        if use_cuda:
+            inputs = ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda", "-i", str(video_path)]
+        else:
+            inputs = ["-i", str(video_path)]
         for overlay in overlays:
+            raw_size = overlay.get("raw_size")
+            if raw_size:
+                # Headerless RGBA frame - a single frame is held by overlay's repeatlast
+                inputs += [
+                    "-f", "rawvideo", "-pix_fmt", "rgba",
+                    "-video_size", f"{raw_size[0]}x{raw_size[1]}",
+                ]
             inputs += ["-i", str(overlay["path"])]
 
         # Build filter complex
         filter_parts = []
         current_output = "0"
+        if use_cuda:
+            # overlay_cuda only blends yuva420p onto yuv420p (not NV12, which
+            # is what the decoder emits), so convert on the GPU first
+            filter_parts.append("[0]scale_cuda=format=yuv420p[base]")
+            current_output = "base"
 
         for i, overlay in enumerate(overlays):
             input_idx = i + 1
@@ -753,9 +901,13 @@ class FFmpegProcessor:
             # Build overlay filter
             x = overlay["x"]
             y = overlay["y"]
-            overlay_filter = f"overlay={x}:{y}"
+            if use_cuda:
+                filter_parts.append(f"[{input_idx}]format=yuva420p,hwupload_cuda[ov{i}]")
+                overlay_filter = f"overlay_cuda=x={x}:y={y}"
+            else:
+                overlay_filter = f"overlay={x}:{y}"
 
-            # Add timing if specified
+            # Add timing if specified (CPU path only; see above)
             start = overlay.get("start_time")
             end = overlay.get("end_time")
             if start is not None and end is not None:
@@ -765,18 +917,24 @@ class FFmpegProcessor:
             elif end is not None:
                 overlay_filter += f":enable='lte(t,{end})'"
 
+            overlay_input = f"ov{i}" if use_cuda else str(input_idx)
             if output_label:
-                filter_parts.append(f"[{current_output}][{input_idx}]{overlay_filter}[{output_label}]")
+                filter_parts.append(f"[{current_output}][{overlay_input}]{overlay_filter}[{output_label}]")
                 current_output = output_label
             else:
-                filter_parts.append(f"[{current_output}][{input_idx}]{overlay_filter}")
+                filter_parts.append(f"[{current_output}][{overlay_input}]{overlay_filter}")
 
         filter_complex = ";".join(filter_parts)
 
         args = inputs + [
             "-filter_complex", filter_complex,
-            *get_video_encoding_args("balanced"),  # Use hardware acceleration if available
-            "-c:a", "copy",
+            *(encoding_args if encoding_args is not None else [
+                # CUDA frames can only go to NVENC; otherwise use hardware
+                # acceleration if available
+                *(["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "23"] if use_cuda
+                  else get_video_encoding_args("balanced")),
+                "-c:a", "copy",
+            ]),
             str(output_path),
         ]
 
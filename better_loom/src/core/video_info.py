@@ -7,8 +7,9 @@ for everything else to work.
 
 import subprocess
 import json
+from functools import lru_cache
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Optional
 
 
@@ -31,12 +32,29 @@ def get_video_info(video_path: str | Path) -> VideoInfo:
     Extract complete video information using ffprobe.
 
     This is critical for accurate segment extraction and timing.
+
+    Memoised on (path, mtime, size) like get_audio_duration; each call
+    still gets its own VideoInfo, carrying the path as passed in.
     """
     video_path = Path(video_path)
 
-    if not video_path.exists():
-        raise FileNotFoundError(f"Video not found: {video_path}")
+    try:
+        stat = video_path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Video not found: {video_path}") from None
+
+    info = _cached_video_info(str(video_path.absolute()), stat.st_mtime_ns, stat.st_size)
+    return replace(info, path=video_path)
+
+
+@lru_cache(maxsize=256)
+def _cached_video_info(video_path: str, mtime_ns: int, size: int) -> VideoInfo:
+    """get_video_info's cache; mtime_ns and size only form the key."""
+    return _probe_video_info(Path(video_path))
+
 
+def _probe_video_info(video_path: Path) -> VideoInfo:
+    """Run ffprobe and parse the result into a VideoInfo."""
     # Run ffprobe with JSON output
     cmd = [
         "ffprobe",
@@ -190,9 +208,29 @@ def fix_webm_duration(video_path: str | Path) -> Path:
 
 
 def get_audio_duration(audio_path: str | Path) -> float:
-    """Get duration of an audio file."""
+    """
+    Get duration of an audio file.
+
+    Memoised on (path, mtime, size), so asking again about an unchanged
+    file costs a stat instead of an ffprobe run.
+    """
     audio_path = Path(audio_path)
+    try:
+        stat = audio_path.stat()
+    except OSError:
+        # Let ffprobe report the missing/unreadable file as usual
+        return _probe_audio_duration(audio_path)
+    return _cached_audio_duration(str(audio_path.absolute()), stat.st_mtime_ns, stat.st_size)
+
 
+@lru_cache(maxsize=4096)
+def _cached_audio_duration(audio_path: str, mtime_ns: int, size: int) -> float:
+    """get_audio_duration's cache; mtime_ns and size only form the key."""
+    return _probe_audio_duration(Path(audio_path))
+
+
+def _probe_audio_duration(audio_path: Path) -> float:
+    """Run ffprobe for an audio file's duration."""
     cmd = [
         "ffprobe",
         "-v", "quiet",
@@ -208,3 +246,67 @@ def get_audio_duration(audio_path: str | Path) -> float:
 
     data = json.loads(result.stdout)
     return float(data["format"]["duration"])
+
+
+def get_video_stream_params(video_path: str | Path) -> dict:
+    """
+    Probe the first video stream's profile, level and pix_fmt.
+
+    Returns a dict with those keys; values are None when ffprobe doesn't
+    report them (level is the raw integer, e.g. 41 for H.264 level 4.1).
+    """
+    video_path = Path(video_path)
+
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream=profile,level,pix_fmt",
+        "-of", "json",
+        str(video_path)
+    ]
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe stream probe failed for {video_path}: {result.stderr}")
+
+    streams = json.loads(result.stdout).get("streams") or [{}]
+    stream = streams[0]
+    return {
+        "profile": stream.get("profile"),
+        "level": stream.get("level"),
+        "pix_fmt": stream.get("pix_fmt"),
+    }
+
+
+def get_keyframe_times(video_path: str | Path) -> list[float]:
+    """
+    List the presentation times (seconds) of the video's keyframes, in order.
+
+    Only keyframes are decoded (-skip_frame nokey), so this is cheap even
+    for long videos.
+    """
+    video_path = Path(video_path)
+
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-skip_frame", "nokey",
+        "-show_entries", "frame=pts_time",
+        "-of", "csv=p=0",
+        str(video_path)
+    ]
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe keyframe scan failed for {video_path}: {result.stderr}")
+
+    times = []
+    for line in result.stdout.splitlines():
+        value = line.strip().rstrip(",")
+        if value and value != "N/A":
+            times.append(float(value))
+    return sorted(times)
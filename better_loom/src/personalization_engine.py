@@ -11,6 +11,7 @@ Complete pipeline for video personalization:
 7. Output final personalized video
 """
 
+import concurrent.futures
 import tempfile
 import shutil
 from pathlib import Path
@@ -145,10 +146,27 @@ class PersonalizationEngine:
         video_path = Path(video_path)
         job = PersonalizationJob(video_path=video_path)
 
-        # Transcribe
+        # Speech and Vision are separate services with no data dependency,
+        # so the frame analysis runs alongside transcription
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            vision_future = None
+            if detect_objects:
+                logger.info("Analyzing video frames with Google Vision...")
+                vision_future = executor.submit(
+                    self.vision_client.analyze_video_frames,
+                    video_path,
+                    interval_seconds=analysis_interval,
+                )
+
+            # Transcribe
+            if transcribe:
+                logger.info("Transcribing video with Google Chirp 3...")
+                job.transcript = self.speech_client.transcribe_video(video_path)
+
+            if vision_future is not None:
+                job.frame_analyses = vision_future.result()
+
         if transcribe:
-            logger.info("Transcribing video with Google Chirp 3...")
-            job.transcript = self.speech_client.transcribe_video(video_path)
             logger.info(f"Transcription complete: {len(job.transcript.segments)} segments")
 
             # Log transcript preview
@@ -157,11 +175,6 @@ class PersonalizationEngine:
 
         # Detect objects and text
         if detect_objects:
-            logger.info("Analyzing video frames with Google Vision...")
-            job.frame_analyses = self.vision_client.analyze_video_frames(
-                video_path,
-                interval_seconds=analysis_interval,
-            )
             logger.info(f"Analyzed {len(job.frame_analyses)} frames")
 
             # Log detection summary
@@ -1,3 +1,19 @@
-from .google_vision import GoogleVisionClient, DetectedObject, DetectedText, FrameAnalysis
+from .google_vision import (
+    GoogleVisionClient,
+    DetectedObject,
+    DetectedText,
+    FrameAnalysis,
+    DetectionTable,
+    get_vision_client,
+    close_vision_client,
+)
 
-__all__ = ["GoogleVisionClient", "DetectedObject", "DetectedText", "FrameAnalysis"]
+__all__ = [
+    "GoogleVisionClient",
+    "DetectedObject",
+    "DetectedText",
+    "FrameAnalysis",
+    "DetectionTable",
+    "get_vision_client",
+    "close_vision_client",
+]
@@ -8,16 +8,78 @@ Key insight: We render text/logos to PNG images, then use
 FFmpeg to composite them onto the video in a single pass.
 """
 
+import concurrent.futures
+import hashlib
+import io
+import os
 import tempfile
+import threading
 from pathlib import Path
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import groupby
 from typing import Optional
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 from loguru import logger
 import httpx
 
-from ..core.ffmpeg_utils import FFmpegProcessor
-from ..core.video_info import get_video_info
+from ..core.ffmpeg_utils import FFmpegProcessor, detect_cuda_overlay, link_or_copy, reflink_or_copy
+from ..core.video_info import VideoInfo, get_video_info
+
+
+# System fonts tried in order when no font_path is given
+_SYSTEM_FONTS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",
+)
+
+
+def _scratch_base_dir() -> Optional[str]:
+    """Prefer RAM-backed /dev/shm for short-lived overlay files when writable.
+
+    Returns None (the system temp dir) elsewhere, e.g. on macOS.
+    """
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return str(shm)
+    return None
+
+
+# Shared drawer used only to measure text; textbbox never touches its image
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+
+@lru_cache(maxsize=64)
+def _load_font(font_path: Optional[str], font_size: int) -> ImageFont.ImageFont:
+    """Load a TrueType font once per (path, size); falls back to PIL's default."""
+    candidates = (font_path,) if font_path else _SYSTEM_FONTS
+    for candidate in candidates:
+        try:
+            return ImageFont.truetype(candidate, font_size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def _choose_resample(src_size: tuple[int, int], dst_size: tuple[int, int]) -> Image.Resampling:
+    """Pick a resampling filter for a resize.
+
+    Downscales of at most 2x look the same with BILINEAR (Pillow's resize
+    is antialiased for every filter) at a fraction of LANCZOS's cost;
+    upscales and larger reductions keep LANCZOS.
+    """
+    src_w, src_h = src_size
+    dst_w, dst_h = dst_size
+    if src_w / 2 <= dst_w <= src_w and src_h / 2 <= dst_h <= src_h:
+        return Image.Resampling.BILINEAR
+    return Image.Resampling.LANCZOS
+
+
+@lru_cache(maxsize=64)
+def _load_basic_font(font_path: Optional[str], font_size: int) -> ImageFont.FreeTypeFont:
+    """Variant of _load_font using Pillow's basic layout engine (no raqm shaping)."""
+    return _load_font(font_path, font_size).font_variant(layout_engine=ImageFont.Layout.BASIC)
 
 
 @dataclass
@@ -38,13 +100,21 @@ class TextOverlay:
 @dataclass
 class ImageOverlay:
     """Configuration for an image overlay."""
-    image_path: Path                 # Path to PNG image
+    image_path: Path                 # Path to RGBA image (PNG or TIFF)
     x: int                           # X position in pixels
     y: int                           # Y position in pixels
     start_time: Optional[float] = None
     end_time: Optional[float] = None
     width: Optional[int] = None      # Resize width (optional)
     height: Optional[int] = None     # Resize height (optional)
+    raw_size: Optional[tuple[int, int]] = None  # (w, h) if image_path holds raw RGBA bytes
+
+
+def _open_overlay(overlay: ImageOverlay) -> Image.Image:
+    """Open an overlay's image, whether encoded or raw RGBA."""
+    if overlay.raw_size is not None:
+        return Image.frombytes("RGBA", overlay.raw_size, Path(overlay.image_path).read_bytes())
+    return Image.open(overlay.image_path)
 
 
 class OverlayEngine:
@@ -76,10 +146,70 @@ class OverlayEngine:
         )
     """
 
-    def __init__(self, temp_dir: Optional[Path] = None):
-        self.temp_dir = temp_dir or Path(tempfile.mkdtemp())
+    # Overlay images are scratch files decoded once by FFmpeg, so favour encode
+    # speed over size (level 1 is ~10x faster than Pillow's default of 6)
+    PNG_COMPRESS_LEVEL = 1
+
+    def __init__(
+        self,
+        temp_dir: Optional[Path] = None,
+        temp_format: str = "tiff",
+        use_cuda: bool = False,
+        raw_mode: bool = False,
+    ):
+        """
+        Args:
+            temp_dir: Directory for intermediate overlay images
+            temp_format: "tiff" (uncompressed RGBA, no encode cost) or "png"
+            use_cuda: Composite on the GPU with overlay_cuda when FFmpeg supports it,
+                NVDEC can decode the video and no overlay is timed
+            raw_mode: Hand text overlays to FFmpeg as raw RGBA frames (no container at all)
+        """
+        if temp_format not in ("tiff", "png"):
+            raise ValueError(f"Unsupported overlay temp format: {temp_format}")
+
+        # An engine-owned TemporaryDirectory is removed by cleanup(), or on
+        # garbage collection / interpreter exit if cleanup() is never reached
+        self._owned_temp_dir: Optional[tempfile.TemporaryDirectory] = None
+        if temp_dir is None:
+            self._owned_temp_dir = tempfile.TemporaryDirectory(prefix="overlays_", dir=_scratch_base_dir())
+            temp_dir = Path(self._owned_temp_dir.name)
+        self.temp_dir = Path(temp_dir)
         self.temp_dir.mkdir(parents=True, exist_ok=True)
-        self._overlay_counter = 0
+        self.temp_format = temp_format
+        self.use_cuda = use_cuda and detect_cuda_overlay()
+        self.raw_mode = raw_mode
+        # Raw overlays carry no header, so their dimensions are tracked here
+        self._raw_sizes: dict[Path, tuple[int, int]] = {}
+        # Shared across downloads so remote images reuse connections
+        self._http = httpx.Client(http2=True, follow_redirects=True, timeout=30.0)
+        # Downloaded image bodies by URL, so a logo reused at several sizes
+        # or positions is fetched once per engine
+        self._url_cache: dict[str, bytes] = {}
+
+    def _overlay_path(self, kind: str, *params) -> Path:
+        """Content-addressed temp path for an overlay rendered from params.
+
+        Identical render parameters map to the same file, so a repeated
+        caption or logo is rendered once and then served from disk.
+        """
+        key = hashlib.blake2b(repr(params).encode(), digest_size=16).hexdigest()
+        return self.temp_dir / f"{kind}_{key}.{self.temp_format}"
+
+    def _save_overlay(self, img: Image.Image, overlay_path: Path) -> None:
+        """Write an RGBA overlay image in the configured temp format.
+
+        Writes to a unique partial file and renames it into place, so two
+        threads rendering the same overlay never expose a half-written file.
+        """
+        partial_path = overlay_path.with_name(f"{overlay_path.name}.{threading.get_ident()}.part")
+        if self.temp_format == "tiff":
+            # Uncompressed TIFF keeps the alpha channel and skips zlib entirely.
+            # (BMP would be cheaper still, but FFmpeg drops 32-bit BMP alpha.)
+            img.save(partial_path, "TIFF", compression="raw")
+        else:
+            img.save(partial_path, "PNG", compress_level=self.PNG_COMPRESS_LEVEL, optimize=False)
+        os.replace(partial_path, overlay_path)
 
     def create_text_overlay(
         self,
@@ -99,28 +229,34 @@ class OverlayEngine:
 
         Returns an ImageOverlay that can be applied to video.
         """
+        overlay_path = self._overlay_path(
+            "text", text, font_path, font_size, color, background_color, padding
+        )
+        if self.raw_mode:
+            overlay_path = overlay_path.with_suffix(".raw")
+        if overlay_path.exists():
+            logger.debug(f"Reusing cached text overlay: '{text}'")
+            return ImageOverlay(
+                image_path=overlay_path,
+                x=x,
+                y=y,
+                start_time=start_time,
+                end_time=end_time,
+                raw_size=self._raw_sizes.get(overlay_path),
+            )
+
         logger.debug(f"Creating text overlay: '{text}'")
 
-        # Load font
-        try:
-            if font_path:
-                font = ImageFont.truetype(font_path, font_size)
-            else:
-                # Try to use a system font
-                try:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", font_size)
-                except OSError:
-                    try:
-                        font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
-                    except OSError:
-                        font = ImageFont.load_default()
-        except Exception:
-            font = ImageFont.load_default()
+        font = _load_font(font_path, font_size)
+        # Plain single-line ASCII needs no complex shaping (HarfBuzz via raqm)
+        simple_text = (
+            text.isascii() and "\n" not in text and isinstance(font, ImageFont.FreeTypeFont)
+        )
+        if simple_text:
+            font = _load_basic_font(font_path, font_size)
 
         # Calculate text size
-        dummy_img = Image.new("RGBA", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-        bbox = draw.textbbox((0, 0), text, font=font)
+        bbox = _MEASURE_DRAW.textbbox((0, 0), text, font=font)
         text_width = bbox[2] - bbox[0]
         text_height = bbox[3] - bbox[1]
 
@@ -133,13 +269,27 @@ class OverlayEngine:
         else:
             img = Image.new("RGBA", (img_width, img_height), (0, 0, 0, 0))
 
-        draw = ImageDraw.Draw(img)
-        draw.text((padding, padding), text, font=font, fill=(*color, 255))
+        if simple_text:
+            # Rasterize the glyph mask and blend it in directly, skipping the
+            # ImageDraw.text wrapper (same placement and blending it performs)
+            mask, (offset_x, offset_y) = font.getmask2(text, mode="L")
+            left, top = padding + offset_x, padding + offset_y
+            img.im.paste((*color, 255), (left, top, left + mask.size[0], top + mask.size[1]), mask)
+        else:
+            draw = ImageDraw.Draw(img)
+            draw.text((padding, padding), text, font=font, fill=(*color, 255))
 
         # Save to temp file
-        self._overlay_counter += 1
-        overlay_path = self.temp_dir / f"text_overlay_{self._overlay_counter}.png"
-        img.save(overlay_path, "PNG")
+        raw_size = None
+        if self.raw_mode:
+            # The pixel buffer is the file - no encode here, no decode in FFmpeg
+            raw_size = img.size
+            self._raw_sizes[overlay_path] = raw_size
+            partial_path = overlay_path.with_name(f"{overlay_path.name}.{threading.get_ident()}.part")
+            partial_path.write_bytes(img.tobytes())
+            os.replace(partial_path, overlay_path)
+        else:
+            self._save_overlay(img, overlay_path)
 
         logger.debug(f"Text overlay created: {overlay_path} ({img_width}x{img_height})")
 
@@ -149,6 +299,7 @@ class OverlayEngine:
             y=y,
             start_time=start_time,
             end_time=end_time,
+            raw_size=raw_size,
         )
 
     def create_image_overlay(
@@ -160,53 +311,107 @@ class OverlayEngine:
         end_time: Optional[float] = None,
         width: Optional[int] = None,
         height: Optional[int] = None,
+        resample: Optional[Image.Resampling] = None,
     ) -> ImageOverlay:
         """
         Create an image overlay from a file or URL.
 
-        Handles downloading from URLs and resizing.
+        Handles downloading from URLs and resizing. resample defaults to
+        BILINEAR for mild downscales (visually identical, several times
+        faster) and LANCZOS otherwise. PNG sources that need no resize are
+        handed to FFmpeg as-is, without a decode/re-encode.
         """
-        self._overlay_counter += 1
-        overlay_path = self.temp_dir / f"image_overlay_{self._overlay_counter}.png"
+        overlay_path = self._overlay_path("image", str(image_source), width, height, resample)
+        passthrough_path = overlay_path.with_suffix(".png")
+        for cached_path in (overlay_path, passthrough_path):
+            if cached_path.exists():
+                # Only the header is read to recover the rendered size
+                with Image.open(cached_path) as cached:
+                    cached_width, cached_height = cached.size
+                logger.debug(f"Reusing cached image overlay: {image_source}")
+                return ImageOverlay(
+                    image_path=cached_path,
+                    x=x,
+                    y=y,
+                    start_time=start_time,
+                    end_time=end_time,
+                    width=cached_width,
+                    height=cached_height,
+                )
 
-        # Load image from file or URL
+        # Load image from file or URL (Image.open only parses the header)
+        source_file: Optional[Path] = None
+        content: Optional[bytes] = None
         if isinstance(image_source, Path) or not str(image_source).startswith(("http://", "https://", "gs://")):
             # Local file
-            img = Image.open(image_source)
+            source_file = Path(image_source)
+            img = Image.open(source_file)
         elif str(image_source).startswith("gs://"):
             # GCS path - download via storage client
             from ..pipeline.storage import StorageClient
             storage = StorageClient()
-            local_path = storage.download(str(image_source))
-            img = Image.open(local_path)
+            source_file = Path(storage.download(str(image_source)))
+            img = Image.open(source_file)
         else:
-            # HTTP URL - download
-            logger.debug(f"Downloading image from {image_source}")
-            response = httpx.get(str(image_source), follow_redirects=True)
-            response.raise_for_status()
-
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as f:
-                f.write(response.content)
-                temp_path = Path(f.name)
-
-            img = Image.open(temp_path)
-            temp_path.unlink()
-
-        # Convert to RGBA for transparency support
-        img = img.convert("RGBA")
-
-        # Resize if needed
+            # HTTP URL - download (once per engine)
+            url = str(image_source)
+            content = self._url_cache.get(url)
+            if content is None:
+                logger.debug(f"Downloading image from {url}")
+                response = self._http.get(url)
+                response.raise_for_status()
+                content = self._url_cache[url] = response.content
+
+            # Decode straight from memory - no temp file round-trip.
+            # The image keeps a reference to the buffer until it is decoded.
+            img = Image.open(io.BytesIO(content))
+
+        # Work out the output size from the header before anything is decoded
+        target_size = None
         if width and height:
-            img = img.resize((width, height), Image.Resampling.LANCZOS)
+            target_size = (width, height)
         elif width:
             ratio = width / img.width
-            img = img.resize((width, int(img.height * ratio)), Image.Resampling.LANCZOS)
+            target_size = (width, int(img.height * ratio))
         elif height:
             ratio = height / img.height
-            img = img.resize((int(img.width * ratio), height), Image.Resampling.LANCZOS)
+            target_size = (int(img.width * ratio), height)
+
+        if target_size is None and img.format == "PNG":
+            # FFmpeg reads the PNG directly; skip decoding and re-encoding it
+            if source_file is not None:
+                link_or_copy(source_file, passthrough_path)
+            else:
+                partial_path = passthrough_path.with_name(f"{passthrough_path.name}.{threading.get_ident()}.part")
+                partial_path.write_bytes(content)
+                os.replace(partial_path, passthrough_path)
+            logger.debug(f"Image overlay passed through: {passthrough_path} ({img.width}x{img.height})")
+            overlay = ImageOverlay(
+                image_path=passthrough_path,
+                x=x,
+                y=y,
+                start_time=start_time,
+                end_time=end_time,
+                width=img.width,
+                height=img.height,
+            )
+            img.close()
+            return overlay
+
+        if target_size is not None:
+            # For JPEG sources, let libjpeg decode at 1/2, 1/4 or 1/8 scale
+            # (never below target_size); a no-op for other formats
+            img.draft("RGB", target_size)
+
+        # Convert to RGBA for transparency support (skip the copy if already RGBA)
+        if img.mode != "RGBA":
+            img = img.convert("RGBA")
+
+        if target_size is not None:
+            img = img.resize(target_size, resample or _choose_resample(img.size, target_size))
 
         # Save
-        img.save(overlay_path, "PNG")
+        self._save_overlay(img, overlay_path)
 
         logger.debug(f"Image overlay created: {overlay_path} ({img.width}x{img.height})")
 
@@ -225,24 +430,36 @@ class OverlayEngine:
         video_path: Path,
         overlays: list[ImageOverlay],
         output_path: Path,
+        video_info: Optional[VideoInfo] = None,
     ) -> Path:
         """
         Apply multiple overlays to a video in a single FFmpeg pass.
 
         This is efficient because FFmpeg processes all overlays
-        in one pass through the video.
+        in one pass through the video. Pass video_info if the caller has
+        already probed the video.
         """
         video_path = Path(video_path)
         output_path = Path(output_path)
 
+        if overlays:
+            # Drop overlays that can never be seen so no-op jobs skip the transcode
+            info = video_info or get_video_info(video_path)
+            visible = [o for o in overlays if self._is_visible(o, info.width, info.height, info.duration)]
+            if len(visible) < len(overlays):
+                logger.debug(f"Skipping {len(overlays) - len(visible)} invisible overlays")
+            overlays = visible
+
         if not overlays:
-            # No overlays, just copy
-            import shutil
-            shutil.copy(video_path, output_path)
-            return output_path
+            # No overlays - copy the source through unchanged. Never a
+            # hardlink: a later in-place write to the output would reach it
+            return reflink_or_copy(video_path, output_path)
 
         logger.info(f"Applying {len(overlays)} overlays to video")
 
+        # Fewer, larger overlay layers mean fewer chained overlay filters
+        overlays = self._merge_same_window(overlays)
+
         # Convert ImageOverlay objects to dict format for FFmpegProcessor
         overlay_dicts = []
         for overlay in overlays:
@@ -252,6 +469,7 @@ class OverlayEngine:
                 "y": overlay.y,
                 "start_time": overlay.start_time,
                 "end_time": overlay.end_time,
+                "raw_size": overlay.raw_size,
             })
 
         # Apply all overlays in one pass
@@ -259,14 +477,115 @@ class OverlayEngine:
             video_path=video_path,
             overlays=overlay_dicts,
             output_path=output_path,
+            # NVDEC must be able to decode the source for the frames to stay on the GPU
+            hw_accel="cuda" if self.use_cuda and detect_cuda_overlay(info.video_codec) else None,
         )
 
         return output_path
 
+    @staticmethod
+    def _is_visible(
+        overlay: ImageOverlay,
+        video_width: int,
+        video_height: int,
+        video_duration: float,
+    ) -> bool:
+        """False if the overlay is off-frame, outside the video's duration, or fully transparent."""
+        # Some containers (e.g. WebM) report no duration; only trust timing
+        # checks when the probe returned one
+        if video_duration > 0:
+            start = overlay.start_time if overlay.start_time is not None else 0.0
+            end = overlay.end_time if overlay.end_time is not None else video_duration
+            if end <= start or end <= 0 or start >= video_duration:
+                return False
+
+        # Size comes from raw_size or the image header; no pixels are decoded
+        if overlay.raw_size is not None:
+            width, height = overlay.raw_size
+            mode = "RGBA"
+        else:
+            with Image.open(overlay.image_path) as img:
+                width, height = img.size
+                mode = img.mode
+        if (
+            overlay.x >= video_width or overlay.y >= video_height
+            or overlay.x + width <= 0 or overlay.y + height <= 0
+        ):
+            return False
+
+        # Only on-frame overlays with an alpha channel need a full decode
+        if mode == "RGBA":
+            with _open_overlay(overlay) as img:
+                if img.getchannel("A").getextrema()[1] == 0:
+                    return False
+
+        return True
+
+    def _merge_same_window(self, overlays: list[ImageOverlay]) -> list[ImageOverlay]:
+        """
+        Pre-composite consecutive overlays that share a time window.
+
+        FFmpeg chains one overlay filter per input, each a serial pass over
+        every frame. Overlays visible over the same interval can be flattened
+        into one RGBA layer up front ("over" compositing is associative, so
+        the result is identical). Only runs of adjacent overlays are merged,
+        preserving stacking order, and only when the combined canvas is not
+        much larger than the layers themselves.
+        """
+        merged = []
+        for window, group in groupby(overlays, key=lambda o: (o.start_time, o.end_time)):
+            group = list(group)
+            if len(group) == 1:
+                merged.extend(group)
+                continue
+
+            images = [_open_overlay(o) for o in group]
+            left = min(o.x for o in group)
+            top = min(o.y for o in group)
+            right = max(o.x + img.width for o, img in zip(group, images))
+            bottom = max(o.y + img.height for o, img in zip(group, images))
+            layer_area = sum(img.width * img.height for img in images)
+
+            if (right - left) * (bottom - top) > 2 * layer_area:
+                # Sparse layout - a mostly transparent canvas would cost more to blend
+                for img in images:
+                    img.close()
+                merged.extend(group)
+                continue
+
+            canvas = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+            for o, img in zip(group, images):
+                with img:
+                    layer = img if img.mode == "RGBA" else img.convert("RGBA")
+                    canvas.alpha_composite(layer, dest=(o.x - left, o.y - top))
+
+            overlay_path = self._overlay_path(
+                "merged", *((str(o.image_path), o.x, o.y) for o in group)
+            )
+            if not overlay_path.exists():
+                self._save_overlay(canvas, overlay_path)
+
+            merged.append(ImageOverlay(
+                image_path=overlay_path,
+                x=left,
+                y=top,
+                start_time=window[0],
+                end_time=window[1],
+                width=canvas.width,
+                height=canvas.height,
+            ))
+
+        if len(merged) < len(overlays):
+            logger.debug(f"Merged {len(overlays)} overlays into {len(merged)} layers")
+        return merged
+
     def cleanup(self):
-        """Remove temp files."""
+        """Close the HTTP client and remove temp files."""
         import shutil
-        if self.temp_dir.exists():
+        self._http.close()
+        if self._owned_temp_dir is not None:
+            self._owned_temp_dir.cleanup()
+        elif self.temp_dir.exists():
             shutil.rmtree(self.temp_dir, ignore_errors=True)
 
 
@@ -274,8 +593,8 @@ def apply_visual_replacements(
     video_path: Path,
     replacements: list[dict],
     output_path: Path,
-    video_width: int,
-    video_height: int,
+    video_width: Optional[int] = None,
+    video_height: Optional[int] = None,
 ) -> Path:
     """
     Convenience function to apply visual replacements.
@@ -286,45 +605,70 @@ def apply_visual_replacements(
     - start_time, end_time: Timing
     - For text: text, font_size, color
     - For image: image_source, width, height
+
+    The video is probed at most once; pass video_width/video_height to
+    skip the probe for the coordinate conversion.
     """
     engine = OverlayEngine()
 
     try:
-        overlays = []
+        if not replacements:
+            return engine.apply_overlays(video_path, [], output_path)
+
+        info = get_video_info(video_path)
+        if video_width is None or video_height is None:
+            video_width, video_height = info.width, info.height
+
+        # Convert relative coordinates to pixels for all replacements at once
+        positions = (
+            np.array([[rep["x"], rep["y"]] for rep in replacements], dtype=np.float64)
+            * (video_width, video_height)
+        ).astype(int).tolist()
+
+        # Downloads, PIL rendering and image encoding all release the GIL,
+        # so overlay assets are built concurrently. map() keeps input order.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(replacements))) as executor:
+            built = list(executor.map(
+                lambda args: _build_overlay(engine, *args),
+                zip(replacements, positions),
+            ))
+
+        overlays = [overlay for overlay in built if overlay is not None]
+        return engine.apply_overlays(video_path, overlays, output_path, video_info=info)
 
-        for rep in replacements:
-            # Convert relative coordinates to pixels
-            x = int(rep["x"] * video_width)
-            y = int(rep["y"] * video_height)
+    finally:
+        engine.cleanup()
 
-            if rep["type"] == "text":
-                overlay = engine.create_text_overlay(
-                    text=rep["text"],
-                    x=x,
-                    y=y,
-                    start_time=rep.get("start_time"),
-                    end_time=rep.get("end_time"),
-                    font_size=rep.get("font_size", 48),
-                    color=rep.get("color", (255, 255, 255)),
-                    background_color=rep.get("background_color"),
-                )
-            elif rep["type"] == "image":
-                overlay = engine.create_image_overlay(
-                    image_source=rep["image_source"],
-                    x=x,
-                    y=y,
-                    start_time=rep.get("start_time"),
-                    end_time=rep.get("end_time"),
-                    width=rep.get("width"),
-                    height=rep.get("height"),
-                )
-            else:
-                logger.warning(f"Unknown replacement type: {rep['type']}")
-                continue
 
-            overlays.append(overlay)
+def _build_overlay(
+    engine: OverlayEngine,
+    rep: dict,
+    position: tuple[int, int],
+) -> Optional[ImageOverlay]:
+    """Create the overlay for one replacement dict at a pixel position (None for unknown types)."""
+    x, y = position
 
-        return engine.apply_overlays(video_path, overlays, output_path)
+    if rep["type"] == "text":
+        return engine.create_text_overlay(
+            text=rep["text"],
+            x=x,
+            y=y,
+            start_time=rep.get("start_time"),
+            end_time=rep.get("end_time"),
+            font_size=rep.get("font_size", 48),
+            color=rep.get("color", (255, 255, 255)),
+            background_color=rep.get("background_color"),
+        )
+    elif rep["type"] == "image":
+        return engine.create_image_overlay(
+            image_source=rep["image_source"],
+            x=x,
+            y=y,
+            start_time=rep.get("start_time"),
+            end_time=rep.get("end_time"),
+            width=rep.get("width"),
+            height=rep.get("height"),
+        )
 
-    finally:
-        engine.cleanup()
+    logger.warning(f"Unknown replacement type: {rep['type']}")
+    return None
@@ -5,18 +5,434 @@ Handles replacement of text, logos, and images in video frames.
 Supports both static overlays and motion-tracked replacements.
 """
 
+import bisect
+import os
+import queue
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 import cv2
 import numpy as np
+import PIL
 from PIL import Image, ImageDraw, ImageFont
 from pathlib import Path
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
 from loguru import logger
-import tempfile
 import ffmpeg as ffmpeg_lib
 
-from .tracker import MotionTracker, BoundingBox, TrackedFrame
+from .tracker import MotionTracker, BoundingBox, TrackedFrames
+from ..core.ffmpeg_utils import FFmpegProcessor, detect_cuda_overlay, detect_hardware_encoder, run_ffmpeg
+from ..core.video_info import get_keyframe_times, get_video_info, get_video_stream_params
 from ..models import VisualSegment, SegmentType
 
+# Pillow-SIMD releases carry a ".postN" version suffix
+if ".post" not in PIL.__version__:
+    logger.debug("Stock Pillow in use - pillow-simd renders text assets several times faster")
+
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+    logger.debug("PyAV not installed - decoding with cv2.VideoCapture")
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.debug("numba not installed - using OpenCV alpha blending")
+
+
+def _edge_ramp_mask(h: int, w: int, feather: int) -> np.ndarray:
+    """
+    Build an (h, w) float32 mask that ramps 0 -> 1 over `feather` pixels
+    from every edge and is 1.0 in the interior.
+
+    Built from two 1-D ramps broadcast against each other, so the cost is
+    a single NumPy pass regardless of feather width.
+    """
+    ys = np.arange(h, dtype=np.float32)
+    xs = np.arange(w, dtype=np.float32)
+    ramp_y = np.minimum(ys, h - 1 - ys) / feather
+    ramp_x = np.minimum(xs, w - 1 - xs) / feather
+    np.clip(ramp_y, 0.0, 1.0, out=ramp_y)
+    np.clip(ramp_x, 0.0, 1.0, out=ramp_x)
+    return np.minimum(ramp_y[:, None], ramp_x[None, :])
+
+
+@lru_cache(maxsize=1)
+def _find_system_font() -> str | None:
+    """Find a good system font for text rendering (probed once per process)."""
+    import platform
+
+    system = platform.system()
+
+    # Fonts to try, in order of preference
+    if system == "Darwin":  # macOS
+        font_paths = [
+            "/System/Library/Fonts/SFNSText.ttf",
+            "/System/Library/Fonts/SFNS.ttf",
+            "/Library/Fonts/SF-Pro-Text-Regular.otf",
+            "/System/Library/Fonts/Helvetica.ttc",
+            "/System/Library/Fonts/HelveticaNeue.ttc",
+            "/Library/Fonts/Arial.ttf",
+            "/System/Library/Fonts/Supplemental/Arial.ttf",
+        ]
+    elif system == "Windows":
+        font_paths = [
+            "C:/Windows/Fonts/segoeui.ttf",
+            "C:/Windows/Fonts/arial.ttf",
+            "C:/Windows/Fonts/calibri.ttf",
+        ]
+    else:  # Linux
+        font_paths = [
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+            "/usr/share/fonts/truetype/ubuntu/Ubuntu-R.ttf",
+            "/usr/share/fonts/TTF/DejaVuSans.ttf",
+        ]
+
+    for path in font_paths:
+        if os.path.exists(path):
+            return path
+
+    return None
+
+
+@lru_cache(maxsize=256)
+def _load_truetype(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load a TrueType font once per (path, size) instead of re-parsing the file."""
+    return ImageFont.truetype(font_path, size)
+
+
+# Threads compositing frames in process_video while the main thread decodes
+_COMPOSITE_WORKERS = min(4, os.cpu_count() or 1)
+
+# Decoded frames buffered ahead of compositing (bounds memory to N frames)
+_DECODE_QUEUE_SIZE = 4
+
+
+def _decode_frames(
+    read_frame: Callable[[], tuple[bool, np.ndarray | None]],
+    frames: queue.Queue,
+    stop: threading.Event,
+) -> None:
+    """Read frames into a bounded queue until EOF or stop is set.
+
+    read_frame follows cv2.VideoCapture.read's (ret, frame) contract.
+    Always ends with a (False, None) sentinel unless stopped first; if
+    read_frame raises, the sentinel carries the exception instead of None.
+    """
+    while not stop.is_set():
+        try:
+            ret, frame = read_frame()
+        except Exception as e:
+            ret, frame = False, e
+        item = (ret, frame if ret or isinstance(frame, Exception) else None)
+        while not stop.is_set():
+            try:
+                frames.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        if not ret:
+            return
+
+
+def _video_codec_kwargs() -> dict:
+    """
+    H.264 encoder settings for process_video output.
+
+    Uses the media engine (NVENC / VideoToolbox) when FFmpeg has one, at a
+    quality comparable to the libx264 CRF 18 software fallback.
+    """
+    hw_encoder = detect_hardware_encoder()
+    if hw_encoder == "nvenc":
+        return {"vcodec": "h264_nvenc", "preset": "p4", "cq": 18}
+    if hw_encoder == "videotoolbox":
+        return {"vcodec": "h264_videotoolbox", "q:v": 50}
+    return {"vcodec": "libx264", "crf": 18}
+
+
+def _write_frame(pipe, frame: np.ndarray) -> None:
+    """Write a BGR frame to the encoder pipe straight from its buffer (no tobytes copy)."""
+    pipe.write(np.ascontiguousarray(frame).data)
+
+
+def _encode_frames(pending: queue.Queue, pipe, errors: list[BaseException]) -> None:
+    """Write composited frames to the encoder pipe in submission order.
+
+    Consumes futures until a None sentinel. The first failure is appended to
+    errors; later futures are then cancelled rather than written, so the
+    producer never blocks on a full queue.
+    """
+    while True:
+        future = pending.get()
+        if future is None:
+            return
+        if errors:
+            future.cancel()
+            continue
+        try:
+            _write_frame(pipe, future.result())
+        except BaseException as e:
+            errors.append(e)
+
+
+def _open_av_reader(video_path: Path) -> tuple[Callable[[], tuple[bool, np.ndarray | None]], Callable[[], None]]:
+    """
+    Open video_path with PyAV for threaded decoding.
+
+    Returns (read_frame, close) where read_frame mimics cv2.VideoCapture.read
+    and yields BGR24 frames.
+    """
+    container = av.open(str(video_path))
+    stream = container.streams.video[0]
+    stream.thread_type = "AUTO"  # Frame + slice threading inside libavcodec
+    decoded = container.decode(stream)
+
+    def read_frame() -> tuple[bool, np.ndarray | None]:
+        for frame in decoded:
+            return True, frame.to_ndarray(format="bgr24")
+        return False, None
+
+    return read_frame, container.close
+
+
+# Max resized assets kept by VisualReplacer between frames
+_RESIZE_CACHE_SIZE = 256
+
+class _GlyphAtlas:
+    """
+    Rasterized glyphs for one (font, size), built lazily and reused.
+
+    Each character is rendered through PIL once; later strings are laid out
+    by advancing a pen with cached advances and pair kerning and copying the
+    cached bitmaps, so FreeType layout is not re-run per string. Only used
+    for plain single-line ASCII, which needs no complex shaping.
+    """
+
+    def __init__(self, font: ImageFont.FreeTypeFont):
+        self.font = font
+        # char -> (bitmap, x offset, y offset, advance)
+        self._glyphs: dict[str, tuple[np.ndarray, int, int, float]] = {}
+        # pair -> extra advance between the two chars
+        self._kerning: dict[str, float] = {}
+
+    def _glyph(self, ch: str) -> tuple[np.ndarray, int, int, float]:
+        glyph = self._glyphs.get(ch)
+        if glyph is None:
+            left, top, right, bottom = self.font.getbbox(ch)
+            if right > left and bottom > top:
+                canvas = Image.new("L", (right - left, bottom - top), 0)
+                ImageDraw.Draw(canvas).text((-left, -top), ch, font=self.font, fill=255)
+                bitmap = np.asarray(canvas)
+            else:
+                bitmap = np.zeros((0, 0), dtype=np.uint8)  # e.g. space
+            glyph = (bitmap, left, top, self.font.getlength(ch))
+            self._glyphs[ch] = glyph
+        return glyph
+
+    def _kern(self, pair: str) -> float:
+        kern = self._kerning.get(pair)
+        if kern is None:
+            kern = self.font.getlength(pair) - self.font.getlength(pair[0]) - self.font.getlength(pair[1])
+            self._kerning[pair] = kern
+        return kern
+
+    def layout(self, text: str) -> tuple[list[tuple[np.ndarray, int, int]], tuple[int, int, int, int]]:
+        """Place text at origin (0, 0); returns (bitmap, x, y) glyphs and their bbox."""
+        placed = []
+        pen = 0.0
+        left = top = right = bottom = 0
+        for i, ch in enumerate(text):
+            if i:
+                pen += self._kern(text[i - 1:i + 1])
+            bitmap, off_x, off_y, advance = self._glyph(ch)
+            if bitmap.size:
+                gx = int(round(pen)) + off_x
+                gh, gw = bitmap.shape
+                if not placed:
+                    left, top, right, bottom = gx, off_y, gx + gw, off_y + gh
+                else:
+                    left, top = min(left, gx), min(top, off_y)
+                    right, bottom = max(right, gx + gw), max(bottom, off_y + gh)
+                placed.append((bitmap, gx, off_y))
+            pen += advance
+        return placed, (left, top, right, bottom)
+
+    @staticmethod
+    def coverage(
+        glyphs: list[tuple[np.ndarray, int, int]],
+        origin: tuple[int, int],
+        size: tuple[int, int],
+    ) -> Image.Image:
+        """Blit laid-out glyphs at origin into an 'L' coverage mask of size (w, h)."""
+        width, height = size
+        mask = np.zeros((height, width), dtype=np.uint8)
+        ox, oy = origin
+        for bitmap, gx, gy in glyphs:
+            x1, y1 = ox + gx, oy + gy
+            gh, gw = bitmap.shape
+            cx1, cy1 = max(0, x1), max(0, y1)
+            cx2, cy2 = min(width, x1 + gw), min(height, y1 + gh)
+            if cx2 <= cx1 or cy2 <= cy1:
+                continue
+            src = bitmap[cy1 - y1:cy2 - y1, cx1 - x1:cx2 - x1]
+            np.maximum(mask[cy1:cy2, cx1:cx2], src, out=mask[cy1:cy2, cx1:cx2])
+        return Image.fromarray(mask)
+
+
+@lru_cache(maxsize=64)
+def _glyph_atlas(font_path: str, size: int) -> _GlyphAtlas:
+    """Shared glyph atlas per (font path, size)."""
+    return _GlyphAtlas(_load_truetype(font_path, size))
+
+
+# 1x3 transform averaging B, G and R into one brightness channel
+_CHANNEL_MEAN = np.full((1, 3), 1 / 3, dtype=np.float32)
+
+# Above this share of the duration, splicing isn't worth the extra passes
+_MAX_SPLICE_COVERAGE = 0.8
+
+# ffprobe H.264 profile names -> encoder -profile:v values every backend accepts
+_SPLICE_PROFILES = {
+    "constrained baseline": "baseline",
+    "baseline": "baseline",
+    "main": "main",
+    "high": "high",
+}
+
+# Point size used for the single reference measurement when auto-fitting text
+_FIT_REFERENCE_SIZE = 64
+
+
+def _fit_font_size(
+    draw: ImageDraw.ImageDraw,
+    text: str,
+    font_path: str | None,
+    available_width: int,
+    available_height: int,
+) -> int:
+    """
+    Pick the largest font size at which `text` fits the available box.
+
+    Glyph metrics scale linearly with point size, so one measurement at a
+    reference size gives the fit in closed form. Hinting can make the real
+    extent overshoot by a pixel, so the result is re-checked and shrunk at
+    most twice.
+    """
+    min_size = 8
+    max_size = max(min_size, int(available_height * 0.9)) * 2
+
+    if not font_path:
+        return min_size  # Default font can't be resized
+    try:
+        ref_font = _load_truetype(font_path, _FIT_REFERENCE_SIZE)
+    except Exception:
+        return min_size
+
+    bbox = draw.textbbox((0, 0), text, font=ref_font)
+    ref_w = bbox[2] - bbox[0]
+    ref_h = bbox[3] - bbox[1]
+    if ref_w <= 0 or ref_h <= 0:
+        return max_size
+
+    scale = min(available_width / ref_w, available_height / ref_h)
+    size = max(min_size, min(max_size, int(_FIT_REFERENCE_SIZE * scale)))
+
+    for _ in range(2):
+        if size <= min_size:
+            break
+        bbox = draw.textbbox((0, 0), text, font=_load_truetype(font_path, size))
+        if bbox[2] - bbox[0] <= available_width and bbox[3] - bbox[1] <= available_height:
+            break
+        size -= 1
+
+    return size
+
+
+def _alpha_blend(
+    roi: np.ndarray,
+    bgr: np.ndarray,
+    alpha_bgr: np.ndarray,
+    inv_alpha_bgr: np.ndarray,
+) -> np.ndarray:
+    """
+    Blend a BGR colour plane over a BGR region using OpenCV's uint8 SIMD kernels.
+
+    alpha_bgr is the overlay's alpha replicated to three channels and
+    inv_alpha_bgr is 255 - alpha_bgr; both are precomputed per resized asset.
+    """
+    fg = cv2.multiply(bgr, alpha_bgr, scale=1 / 255.0)
+    bg = cv2.multiply(roi, inv_alpha_bgr, scale=1 / 255.0)
+    return cv2.add(fg, bg)
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True, nogil=True)
+    def _blend_over_bgr(roi, bgr, alpha):
+        """Fused in-place alpha blend: one pass over roi, rows split across cores."""
+        for y in prange(roi.shape[0]):
+            for x in range(roi.shape[1]):
+                a = np.int32(alpha[y, x])
+                if a == 0:
+                    continue
+                if a == 255:
+                    for c in range(3):
+                        roi[y, x, c] = bgr[y, x, c]
+                    continue
+                ia = 255 - a
+                for c in range(3):
+                    roi[y, x, c] = (a * np.int32(bgr[y, x, c]) + ia * np.int32(roi[y, x, c]) + 127) // 255
+
+
+def _edge_blend_sizes(h: int, w: int) -> tuple[int, int]:
+    """Blur kernel (odd, 3-9) and edge ramp width used to soften an h x w fill."""
+    blur_size = max(3, min(9, h // 10, w // 10))
+    if blur_size % 2 == 0:
+        blur_size += 1
+    return blur_size, max(2, min(h, w) // 8)
+
+
+def _soft_blur(region: np.ndarray, blur_size: int) -> np.ndarray:
+    """
+    Gaussian-blur a region at half resolution and scale it back up.
+
+    The result is only used as a soft edge blend, so the lost detail is
+    invisible, while the convolution touches a quarter of the pixels. The
+    kernel is halved to keep the same apparent blur radius. Regions too
+    small to halve are blurred directly.
+    """
+    h, w = region.shape[:2]
+    if h < 16 or w < 16:
+        return cv2.GaussianBlur(region, (blur_size, blur_size), 0)
+
+    small_kernel = max(3, (blur_size // 2) | 1)
+    small = cv2.resize(region, (w // 2, h // 2), interpolation=cv2.INTER_AREA)
+    small = cv2.GaussianBlur(small, (small_kernel, small_kernel), 0)
+    return cv2.resize(small, (w, h), interpolation=cv2.INTER_LINEAR)
+
+
+def _clip_region(x: int, y: int, w: int, h: int, frame_w: int, frame_h: int) -> tuple[int, int, int, int]:
+    """Clamp a pixel rect to the frame, returning (x1, y1, x2, y2).
+
+    Kept as scalar builtins: for four values this beats a np.clip call,
+    which pays array construction on every frame.
+    """
+    return max(0, x), max(0, y), min(frame_w, x + w), min(frame_h, y + h)
+
+
+def _split_planes(image: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Split a BGR(A) image into contiguous BGR and alpha planes (opaque if no alpha)."""
+    if image.ndim == 3 and image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2BGR), np.ascontiguousarray(image[:, :, 3])
+    bgr = np.ascontiguousarray(image[:, :, :3])
+    return bgr, np.full(bgr.shape[:2], 255, dtype=np.uint8)
+
 
 @dataclass
 class ReplacementAsset:
@@ -24,6 +440,120 @@ class ReplacementAsset:
     image: np.ndarray    # BGRA image (with alpha channel)
     width: int
     height: int
+    # Colour and alpha as separate contiguous planes; derived from image
+    # when not given, so compositing never re-slices channels per frame
+    bgr: np.ndarray | None = None
+    alpha: np.ndarray | None = None
+
+    def __post_init__(self):
+        if self.bgr is None or self.alpha is None:
+            self.bgr, self.alpha = _split_planes(self.image)
+
+
+@dataclass
+class _StaticPlate:
+    """
+    Precomposited result for a segment that never moves.
+
+    With a fixed asset, bbox and background colour, composite_frame's output
+    is const + weight * blur(original region): only the feathered edge band
+    (where weight > 0) still depends on the frame. When weight is zero
+    everywhere (opaque assets) const is the whole answer.
+    """
+    region: tuple[int, int, int, int]   # x1, y1, x2, y2
+    const: np.ndarray                   # float32 (h, w, 3), or uint8 when weight is None
+    weight: np.ndarray | None           # float32 (h, w, 1)
+    blur_size: int
+
+
+@dataclass
+class _ResizedPlanes:
+    """An asset's planes resized to one bbox size, with blend-ready extras."""
+    bgr: np.ndarray
+    alpha: np.ndarray
+    alpha_bgr: np.ndarray    # alpha replicated to 3 channels for cv2.multiply
+    inv_alpha_bgr: np.ndarray  # 255 - alpha_bgr
+    opaque: bool             # every alpha is 255: plain copy
+    transparent: bool        # every alpha is 0: nothing to draw
+    mask: np.ndarray | None = None  # (h, w, 1) bool where alpha is 255, set when alpha is only 0/255
+
+    @classmethod
+    def from_asset(cls, asset: ReplacementAsset, w: int, h: int) -> "_ResizedPlanes":
+        src_h, src_w = asset.alpha.shape[:2]
+        if (w, h) == (src_w, src_h):
+            # Already the bbox size (e.g. text rendered for this box)
+            bgr, alpha = asset.bgr, asset.alpha
+        else:
+            # INTER_AREA is both faster and alias-free when shrinking;
+            # LANCZOS4 keeps upscaled edges sharp
+            interp = cv2.INTER_AREA if w * h < src_w * src_h else cv2.INTER_LANCZOS4
+            bgr = cv2.resize(asset.bgr, (w, h), interpolation=interp)
+            alpha = cv2.resize(asset.alpha, (w, h), interpolation=interp)
+        min_alpha, max_alpha, _, _ = cv2.minMaxLoc(alpha)
+        alpha_bgr = cv2.cvtColor(alpha, cv2.COLOR_GRAY2BGR)
+        # Cut-out assets (alpha only 0 or 255) composite as a masked copy
+        mask = None
+        if 0 < max_alpha and min_alpha < 255:
+            solid = alpha == 255
+            if np.count_nonzero(solid) + np.count_nonzero(alpha == 0) == alpha.size:
+                mask = solid[:, :, np.newaxis]
+        return cls(
+            bgr=bgr,
+            alpha=alpha,
+            alpha_bgr=alpha_bgr,
+            inv_alpha_bgr=cv2.bitwise_not(alpha_bgr),
+            opaque=min_alpha == 255,
+            transparent=max_alpha == 0,
+            mask=mask,
+        )
+
+
+def _edit_windows(
+    segments: list[VisualSegment],
+    assets: dict[str, ReplacementAsset],
+    keyframes: list[float],
+    duration: float,
+) -> list[tuple[float, float]]:
+    """
+    Merge segment time ranges into keyframe-aligned (start, end) windows.
+
+    Each window starts on the last keyframe at or before its segments and
+    ends on the first keyframe after them (or at the end of the video), so
+    the ranges between windows can be stream-copied.
+    """
+    spans = sorted(
+        (segment.start_time, segment.end_time)
+        for segment in segments
+        if segment.placeholder_key in assets
+    )
+
+    windows: list[tuple[float, float]] = []
+    for start, end in spans:
+        i = bisect.bisect_right(keyframes, start) - 1
+        window_start = keyframes[i] if i >= 0 else 0.0
+        j = bisect.bisect_right(keyframes, end)
+        window_end = keyframes[j] if j < len(keyframes) else duration
+
+        if windows and window_start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], window_end))
+        else:
+            windows.append((window_start, window_end))
+    return windows
+
+
+def _splice_encoder_params(stream: dict) -> dict | None:
+    """
+    Encoder options that make re-encoded windows match the source stream.
+
+    Stream-copied and re-encoded pieces are concatenated without
+    re-encoding, so their profile, level and pix_fmt must agree. Returns
+    None when the source uses something the encoders can't reproduce.
+    """
+    profile = _SPLICE_PROFILES.get(str(stream.get("profile") or "").lower())
+    level = stream.get("level")
+    if profile is None or stream.get("pix_fmt") != "yuv420p" or not isinstance(level, int) or level < 10:
+        return None
+    return {"profile:v": profile, "level": f"{level // 10}.{level % 10}", "pix_fmt": "yuv420p"}
 
 
 class VisualReplacer:
@@ -39,47 +569,30 @@ class VisualReplacer:
     """
 
     def __init__(self):
+        # Make sure OpenCV's SIMD paths are on and leave headroom in its
+        # thread pool for the compositing workers in process_video
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(max(1, (os.cpu_count() or 2) // 2))
+
         self.tracker = MotionTracker()
         # Default font for text rendering
         self.default_font = None  # Will use PIL default
+        # (id(image), w, h) -> (image, resized) for composite_frame
+        self._resize_cache: dict[tuple[int, int, int], tuple[np.ndarray, _ResizedPlanes]] = {}
+        # (segment id, frame h, frame w) -> precomposited plate for static segments
+        self._static_cache: dict[tuple[str, int, int], _StaticPlate] = {}
+
+        if NUMBA_AVAILABLE:
+            # Pay the JIT compile (or cache load) cost up front, not on the first frame
+            _blend_over_bgr(
+                np.zeros((1, 1, 3), dtype=np.uint8),
+                np.zeros((1, 1, 3), dtype=np.uint8),
+                np.zeros((1, 1), dtype=np.uint8),
+            )
 
     def _find_system_font(self) -> str | None:
         """Find a good system font for text rendering."""
-        import platform
-        import os
-
-        system = platform.system()
-
-        # Fonts to try, in order of preference
-        if system == "Darwin":  # macOS
-            font_paths = [
-                "/System/Library/Fonts/SFNSText.ttf",
-                "/System/Library/Fonts/SFNS.ttf",
-                "/Library/Fonts/SF-Pro-Text-Regular.otf",
-                "/System/Library/Fonts/Helvetica.ttc",
-                "/System/Library/Fonts/HelveticaNeue.ttc",
-                "/Library/Fonts/Arial.ttf",
-                "/System/Library/Fonts/Supplemental/Arial.ttf",
-            ]
-        elif system == "Windows":
-            font_paths = [
-                "C:/Windows/Fonts/segoeui.ttf",
-                "C:/Windows/Fonts/arial.ttf",
-                "C:/Windows/Fonts/calibri.ttf",
-            ]
-        else:  # Linux
-            font_paths = [
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-                "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-                "/usr/share/fonts/truetype/ubuntu/Ubuntu-R.ttf",
-                "/usr/share/fonts/TTF/DejaVuSans.ttf",
-            ]
-
-        for path in font_paths:
-            if os.path.exists(path):
-                return path
-
-        return None
+        return _find_system_font()
 
     def create_text_asset(
         self,
@@ -116,6 +629,12 @@ class VisualReplacer:
         width = max(width, 20)
         height = max(height, 12)
 
+        # Colours are swizzled to BGR up front: PIL treats channels
+        # independently, so the rendered buffer is already BGRA for OpenCV
+        color = tuple(color[::-1])
+        if bg_color:
+            bg_color = tuple(bg_color[::-1])
+
         # Create image with background
         if bg_color:
             img = Image.new("RGBA", (width, height), (*bg_color, 255))
@@ -134,51 +653,29 @@ class VisualReplacer:
         available_height = int(height * 0.85) - (padding * 2)
 
         if font_size is None:
-            # Start with height-based estimate
-            font_size = max(8, int(available_height * 0.9))
-
-            # Binary search for best font size
-            min_size, max_size = 8, font_size * 2
-            best_size = 8
-
-            for _ in range(20):  # Max iterations
-                test_size = (min_size + max_size) // 2
-                try:
-                    if font_path:
-                        test_font = ImageFont.truetype(font_path, test_size)
-                    else:
-                        test_font = ImageFont.load_default()
-                        break  # Default font can't be resized
-                except Exception:
-                    test_font = ImageFont.load_default()
-                    break
-
-                bbox = draw.textbbox((0, 0), text, font=test_font)
-                text_w = bbox[2] - bbox[0]
-                text_h = bbox[3] - bbox[1]
-
-                if text_w <= available_width and text_h <= available_height:
-                    best_size = test_size
-                    min_size = test_size + 1
-                else:
-                    max_size = test_size - 1
-
-                if min_size > max_size:
-                    break
-
-            font_size = best_size
+            font_size = _fit_font_size(draw, text, font_path, available_width, available_height)
 
         # Load final font
+        loaded_truetype = False
         try:
             if font_path:
-                font = ImageFont.truetype(font_path, font_size)
+                font = _load_truetype(font_path, font_size)
+                loaded_truetype = True
             else:
                 font = ImageFont.load_default()
         except Exception:
             font = ImageFont.load_default()
 
-        # Get text metrics for proper positioning
-        bbox = draw.textbbox((0, 0), text, font=font)
+        # Plain single-line ASCII is assembled from cached glyphs; anything
+        # that may need shaping goes through ImageDraw. The atlas reloads the
+        # font from font_path, so only use it when that load succeeded.
+        atlas = None
+        if loaded_truetype and text.isascii() and "\n" not in text:
+            atlas = _glyph_atlas(font_path, font_size)
+            glyphs, bbox = atlas.layout(text)
+        else:
+            # Get text metrics for proper positioning
+            bbox = draw.textbbox((0, 0), text, font=font)
         text_width = bbox[2] - bbox[0]
         text_height = bbox[3] - bbox[1]
 
@@ -198,36 +695,20 @@ class VisualReplacer:
             x = padding - bbox_x_offset
 
         # Draw text
-        draw.text((x, y), text, font=font, fill=(*color, 255))
+        if atlas is not None:
+            img.paste((*color, 255), (0, 0), atlas.coverage(glyphs, (x, y), img.size))
+        else:
+            draw.text((x, y), text, font=font, fill=(*color, 255))
 
-        # Convert to numpy for OpenCV processing
-        cv_img = cv2.cvtColor(np.array(img), cv2.COLOR_RGBA2BGRA)
+        # Already in BGRA order; one copy out of the PIL buffer
+        cv_img = np.array(img)
 
         # Apply edge feathering for smoother blending
         if edge_feather > 0 and bg_color:
-            # Create a mask for the edges
+            # Gradient mask for the edges, applied to the alpha channel
             h, w = cv_img.shape[:2]
-
-            # Create gradient mask for edges
-            mask = np.ones((h, w), dtype=np.float32)
-
-            # Feather top edge
-            for i in range(min(edge_feather, h)):
-                mask[i, :] = i / edge_feather
-            # Feather bottom edge
-            for i in range(min(edge_feather, h)):
-                mask[h - 1 - i, :] = i / edge_feather
-            # Feather left edge
-            for i in range(min(edge_feather, w)):
-                mask[:, i] = np.minimum(mask[:, i], i / edge_feather)
-            # Feather right edge
-            for i in range(min(edge_feather, w)):
-                mask[:, w - 1 - i] = np.minimum(mask[:, w - 1 - i], i / edge_feather)
-
-            # Apply to alpha channel
-            alpha = cv_img[:, :, 3].astype(np.float32) / 255.0
-            alpha = alpha * mask
-            cv_img[:, :, 3] = (alpha * 255).astype(np.uint8)
+            mask = _edge_ramp_mask(h, w, edge_feather)
+            cv_img[:, :, 3] = (cv_img[:, :, 3] * mask).astype(np.uint8)
 
         return ReplacementAsset(image=cv_img, width=width, height=height)
 
@@ -295,10 +776,7 @@ class VisualReplacer:
         x, y, w, h = bbox.to_pixels(frame_w, frame_h)
 
         # Clamp to frame bounds
-        x1 = max(0, x)
-        y1 = max(0, y)
-        x2 = min(frame_w, x + w)
-        y2 = min(frame_h, y + h)
+        x1, y1, x2, y2 = _clip_region(x, y, w, h, frame_w, frame_h)
 
         if x2 <= x1 or y2 <= y1:
             return (255, 255, 255)  # Default white
@@ -319,30 +797,29 @@ class VisualReplacer:
         bg_color = self.sample_background_color(frame, bbox)
         bg_brightness = (bg_color[0] + bg_color[1] + bg_color[2]) / 3
 
-        # Sample center pixels and find the one most different from background
-        center_pixels = center_region[:, :, :3].reshape(-1, 3)
-
-        if len(center_pixels) == 0:
+        # Sample center pixels and find the ones most different from background
+        if center_region.size == 0:
             # Return contrasting color based on background
             if bg_brightness > 128:
                 return (0, 0, 0)  # Dark text on light bg
             else:
                 return (255, 255, 255)  # Light text on dark bg
 
-        # Calculate brightness difference from background for each pixel
-        pixel_brightness = np.mean(center_pixels, axis=1)
+        # Per-pixel brightness as the plain mean of B, G and R. Transform in
+        # float32 so the mean isn't rounded to uint8.
+        pixel_brightness = cv2.transform(center_region.astype(np.float32), _CHANNEL_MEAN)
 
-        # Find pixels with highest contrast to background
+        # Mask pixels with highest contrast to background
         if bg_brightness > 128:
             # Light background - look for darker pixels
-            contrast_pixels = center_pixels[pixel_brightness < bg_brightness - 30]
+            mask = cv2.compare(pixel_brightness, bg_brightness - 30, cv2.CMP_LT)
         else:
             # Dark background - look for lighter pixels
-            contrast_pixels = center_pixels[pixel_brightness > bg_brightness + 30]
+            mask = cv2.compare(pixel_brightness, bg_brightness + 30, cv2.CMP_GT)
 
-        if len(contrast_pixels) > 0:
+        if cv2.countNonZero(mask) > 0:
             # Average of contrasting pixels (likely the text)
-            mean_color = np.mean(contrast_pixels, axis=0)
+            mean_color = cv2.mean(center_region, mask=mask)
             # Convert BGR to RGB
             return (int(mean_color[2]), int(mean_color[1]), int(mean_color[0]))
 
@@ -370,10 +847,7 @@ class VisualReplacer:
         x, y, w, h = bbox.to_pixels(frame_w, frame_h)
 
         # Clamp to frame bounds
-        x1 = max(0, x)
-        y1 = max(0, y)
-        x2 = min(frame_w, x + w)
-        y2 = min(frame_h, y + h)
+        x1, y1, x2, y2 = _clip_region(x, y, w, h, frame_w, frame_h)
 
         if x2 <= x1 or y2 <= y1:
             return (128, 128, 128)  # Default gray
@@ -383,29 +857,55 @@ class VisualReplacer:
 
         if sample_edges and roi_h > 4 and roi_w > 4:
             # Sample from corners and edges (avoid center where text likely is)
-            edge_pixels = []
-            edge_thickness = max(2, min(roi_h, roi_w) // 8)  # 2-8 pixels
-
-            # Top edge
-            edge_pixels.extend(roi[:edge_thickness, :, :3].reshape(-1, 3))
-            # Bottom edge
-            edge_pixels.extend(roi[-edge_thickness:, :, :3].reshape(-1, 3))
-            # Left edge (excluding corners already counted)
-            edge_pixels.extend(roi[edge_thickness:-edge_thickness, :edge_thickness, :3].reshape(-1, 3))
-            # Right edge (excluding corners already counted)
-            edge_pixels.extend(roi[edge_thickness:-edge_thickness, -edge_thickness:, :3].reshape(-1, 3))
-
-            if edge_pixels:
-                edge_array = np.array(edge_pixels)
-                mean_color = np.mean(edge_array, axis=0)
+            et = max(2, min(roi_h, roi_w) // 8)  # 2-8 pixels
+
+            # Top/bottom strips span the full width; left/right strips
+            # exclude the corners already counted. Each strip is reduced with
+            # cv2.mean and the results are weighted by pixel count.
+            strips = (
+                (roi[:et], et * roi_w),
+                (roi[-et:], et * roi_w),
+                (roi[et:-et, :et], et * (roi_h - 2 * et)),
+                (roi[et:-et, -et:], et * (roi_h - 2 * et)),
+            )
+            total = 0
+            acc = np.zeros(3, dtype=np.float64)
+            for strip, weight in strips:
+                if weight > 0:
+                    acc += np.asarray(cv2.mean(strip)[:3]) * weight
+                    total += weight
+
+            if total:
+                mean_color = acc / total
                 # Convert BGR to RGB
                 return (int(mean_color[2]), int(mean_color[1]), int(mean_color[0]))
 
         # Fallback: sample entire region
-        mean_color = cv2.mean(roi[:, :, :3])
+        mean_color = cv2.mean(roi)
         # Convert BGR to RGB
         return (int(mean_color[2]), int(mean_color[1]), int(mean_color[0]))
 
+    def _resized_asset(self, asset: ReplacementAsset, w: int, h: int) -> _ResizedPlanes:
+        """
+        Return the asset's planes resized to (w, h), reusing earlier resizes.
+
+        Static segments hit the same size every frame, so the resize
+        runs once per segment instead of once per frame. Tracked segments
+        whose size drifts just miss and resize as before; the cache is
+        bounded and cleared at the end of process_video.
+        """
+        key = (id(asset.image), w, h)
+        cached = self._resize_cache.get(key)
+        # The cached entry holds the source array, so its id can't be reused
+        if cached is not None and cached[0] is asset.image:
+            return cached[1]
+
+        resized = _ResizedPlanes.from_asset(asset, w, h)
+        if len(self._resize_cache) >= _RESIZE_CACHE_SIZE:
+            self._resize_cache.clear()
+        self._resize_cache[key] = (asset.image, resized)
+        return resized
+
     def composite_frame(
         self,
         frame: np.ndarray,
@@ -421,7 +921,7 @@ class VisualReplacer:
         Handles alpha blending for smooth edges.
 
         Args:
-            frame: The video frame to modify
+            frame: The BGR video frame to modify (as read by cv2.VideoCapture)
             asset: The replacement asset to overlay
             bbox: Bounding box for placement
             fill_background: If True, fill the region with bg_color first
@@ -438,13 +938,10 @@ class VisualReplacer:
         h = max(h, 1)
 
         # Resize asset to fit bbox with high-quality interpolation
-        resized = cv2.resize(asset.image, (w, h), interpolation=cv2.INTER_LANCZOS4)
+        resized = self._resized_asset(asset, w, h)
 
         # Ensure we don't go out of bounds
-        x1 = max(0, x)
-        y1 = max(0, y)
-        x2 = min(frame_w, x + w)
-        y2 = min(frame_h, y + h)
+        x1, y1, x2, y2 = _clip_region(x, y, w, h, frame_w, frame_h)
 
         # Adjust asset crop if bbox is partially out of frame
         ax1 = x1 - x
@@ -461,68 +958,434 @@ class VisualReplacer:
                 # Sample background from current region
                 bg_color = self.sample_background_color(frame, bbox)
 
-            # Create a slightly blurred background fill for smoother blending
-            bg_fill = np.full((y2 - y1, x2 - x1, 3), (bg_color[2], bg_color[1], bg_color[0]), dtype=np.uint8)
+            # Background colour in BGR order
+            bg_bgr = (int(bg_color[2]), int(bg_color[1]), int(bg_color[0]))
 
             if blur_edges:
                 # Apply slight Gaussian blur to the existing region before replacing
                 # This helps blend the edges more naturally
-                blur_size = max(3, min(9, (y2 - y1) // 10, (x2 - x1) // 10))
-                if blur_size % 2 == 0:
-                    blur_size += 1
+                edge_h, edge_w = y2 - y1, x2 - x1
+                blur_size, edge_size = _edge_blend_sizes(edge_h, edge_w)
 
-                # Blend original edges with background color
-                original_roi = frame[y1:y2, x1:x2].copy()
-                blurred_original = cv2.GaussianBlur(original_roi, (blur_size, blur_size), 0)
+                # Blend original edges with background color (GaussianBlur
+                # writes a new array, so the region needs no defensive copy)
+                blurred_original = _soft_blur(frame[y1:y2, x1:x2], blur_size)
 
                 # Create edge mask - stronger background in center, blend at edges
-                edge_h, edge_w = bg_fill.shape[:2]
-                edge_mask = np.ones((edge_h, edge_w), dtype=np.float32)
-
-                edge_size = max(2, min(edge_h, edge_w) // 8)
-                for i in range(edge_size):
-                    blend = i / edge_size
-                    if i < edge_h:
-                        edge_mask[i, :] = blend
-                        edge_mask[edge_h - 1 - i, :] = np.minimum(edge_mask[edge_h - 1 - i, :], blend)
-                    if i < edge_w:
-                        edge_mask[:, i] = np.minimum(edge_mask[:, i], blend)
-                        edge_mask[:, edge_w - 1 - i] = np.minimum(edge_mask[:, edge_w - 1 - i], blend)
-
-                # Blend: center is bg_fill, edges blend with blurred original
+                edge_mask = _edge_ramp_mask(edge_h, edge_w, edge_size)
+
+                # Blend: center is the bg colour (broadcast, never materialised
+                # as a full fill), edges blend with blurred original
                 edge_mask_3d = edge_mask[:, :, np.newaxis]
+                bg_fill = np.array(bg_bgr, dtype=np.float32)
                 blended_bg = (edge_mask_3d * bg_fill + (1 - edge_mask_3d) * blurred_original).astype(np.uint8)
                 frame[y1:y2, x1:x2] = blended_bg
             else:
-                frame[y1:y2, x1:x2] = bg_fill
+                # Fill the region in place
+                cv2.rectangle(frame, (x1, y1), (x2 - 1, y2 - 1), bg_bgr, thickness=cv2.FILLED)
+
+        if resized.transparent:
+            return frame
 
         # Extract regions
         roi = frame[y1:y2, x1:x2]
-        overlay = resized[ay1:ay2, ax1:ax2]
+        overlay_bgr = resized.bgr[ay1:ay2, ax1:ax2]
 
         # Alpha blending
-        if overlay.shape[2] == 4:
-            alpha = overlay[:, :, 3:4] / 255.0
-            overlay_rgb = overlay[:, :, :3]
+        if resized.opaque:
+            frame[y1:y2, x1:x2] = overlay_bgr
+        elif resized.mask is not None:
+            # roi is a view of frame, so this copies in place
+            np.copyto(roi, overlay_bgr, where=resized.mask[ay1:ay2, ax1:ax2])
+        elif NUMBA_AVAILABLE:
+            # roi is a view of frame, so this blends in place
+            _blend_over_bgr(roi, overlay_bgr, resized.alpha[ay1:ay2, ax1:ax2])
+        else:
+            frame[y1:y2, x1:x2] = _alpha_blend(
+                roi,
+                overlay_bgr,
+                resized.alpha_bgr[ay1:ay2, ax1:ax2],
+                resized.inv_alpha_bgr[ay1:ay2, ax1:ax2],
+            )
+
+        return frame
+
+    @staticmethod
+    def _build_active_table(
+        segments: list[VisualSegment],
+        assets: dict[str, ReplacementAsset],
+        tracking_data: dict[str, TrackedFrames],
+        fps: float,
+    ) -> list[list[tuple[VisualSegment, ReplacementAsset, BoundingBox]]]:
+        """
+        Bucket segments by frame number with their bbox already resolved.
+
+        Entry f lists (segment, asset, bbox) for every segment active at
+        f / fps, in segment order, so the frame loop only visits segments
+        that are actually on screen. Frames past the end of the list have
+        no active segments.
+        """
+        resolved = []
+        last_frame = -1
+        for segment in segments:
+            asset = assets.get(segment.placeholder_key)
+            if asset is None:
+                continue
+            # Candidate range padded by one frame, then filtered with the exact
+            # time test so float rounding matches a per-frame time comparison
+            first = max(0, int(segment.start_time * fps) - 1)
+            last = int(segment.end_time * fps) + 1
+            frames = [
+                f for f in range(first, last + 1)
+                if segment.start_time <= f / fps <= segment.end_time
+            ]
+            if frames:
+                resolved.append((segment, asset, frames))
+                last_frame = max(last_frame, frames[-1])
+
+        active: list[list[tuple[VisualSegment, ReplacementAsset, BoundingBox]]] = [
+            [] for _ in range(last_frame + 1)
+        ]
+        for segment, asset, frames in resolved:
+            static_bbox = BoundingBox(
+                x=segment.x, y=segment.y,
+                width=segment.width, height=segment.height
+            )
+            tracked_frames = tracking_data.get(segment.id)
+            start_frame = int(segment.start_time * fps)
+
+            for f in frames:
+                bbox = static_bbox
+                if tracked_frames is not None:
+                    idx = f - start_frame
+                    if 0 <= idx < len(tracked_frames):
+                        bbox = tracked_frames[idx].bbox
+                active[f].append((segment, asset, bbox))
+
+        return active
+
+    def _presample_bg_colors(
+        self,
+        cap: cv2.VideoCapture,
+        active_by_frame: list[list[tuple[VisualSegment, ReplacementAsset, BoundingBox]]],
+        static_ids: set[str],
+    ) -> dict[str, tuple[int, int, int]]:
+        """
+        Sample every segment's background colour from the frame where it first appears.
+
+        Seeks once per distinct first frame, then rewinds cap to the start.
+        Segments whose frame can't be read are left out; composite_frame
+        then samples their region on each frame instead. Segments in
+        static_ids also get their precomposited plate built here, once,
+        rather than by whichever compositing threads reach them first.
+        """
+        first_seen: dict[int, list[tuple[str, ReplacementAsset, BoundingBox]]] = {}
+        seen: set[str] = set()
+        for frame_num, active in enumerate(active_by_frame):
+            for segment, asset, bbox in active:
+                if segment.id not in seen:
+                    seen.add(segment.id)
+                    first_seen.setdefault(frame_num, []).append((segment.id, asset, bbox))
+
+        bg_colors: dict[str, tuple[int, int, int]] = {}
+        for frame_num, entries in first_seen.items():
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_num)
+            ret, frame = cap.read()
+            if not ret:
+                logger.warning(f"Could not read frame {frame_num} to sample background colors")
+                continue
+            for segment_id, asset, bbox in entries:
+                bg_colors[segment_id] = self.sample_background_color(frame, bbox)
+                logger.debug(f"Sampled background color for {segment_id}: RGB{bg_colors[segment_id]}")
+
+                if segment_id in static_ids:
+                    plate = self._static_plate(frame, asset, bbox, bg_colors[segment_id])
+                    if plate is not None:
+                        self._static_cache[(segment_id, frame.shape[0], frame.shape[1])] = plate
+
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return bg_colors
+
+    def _static_plate(
+        self,
+        frame: np.ndarray,
+        asset: ReplacementAsset,
+        bbox: BoundingBox,
+        bg_color: tuple[int, int, int],
+    ) -> _StaticPlate | None:
+        """
+        Build the frame-independent part of composite_frame for a fixed bbox.
+
+        Mirrors composite_frame with fill_background and blur_edges on.
+        Returns None when the bbox is entirely out of frame.
+        """
+        frame_h, frame_w = frame.shape[:2]
+        x, y, w, h = bbox.to_pixels(frame_w, frame_h)
+        w = max(w, 1)
+        h = max(h, 1)
+        x1, y1, x2, y2 = _clip_region(x, y, w, h, frame_w, frame_h)
+        if x2 <= x1 or y2 <= y1:
+            return None
+
+        resized = self._resized_asset(asset, w, h)
+        ay1, ax1 = y1 - y, x1 - x
+        ay2, ax2 = ay1 + (y2 - y1), ax1 + (x2 - x1)
+
+        region_h, region_w = y2 - y1, x2 - x1
+        blur_size, edge_size = _edge_blend_sizes(region_h, region_w)
+        edge_mask = _edge_ramp_mask(region_h, region_w, edge_size)[:, :, np.newaxis]
 
-            # Ensure roi is BGR (3 channels)
-            if roi.shape[2] == 4:
-                roi = roi[:, :, :3]
+        alpha = resized.alpha[ay1:ay2, ax1:ax2, np.newaxis].astype(np.float32) / 255.0
+        overlay = resized.bgr[ay1:ay2, ax1:ax2].astype(np.float32)
+        bg = np.array((bg_color[2], bg_color[1], bg_color[0]), dtype=np.float32)
 
-            # Blend
-            blended = (alpha * overlay_rgb + (1 - alpha) * roi).astype(np.uint8)
-            frame[y1:y2, x1:x2] = blended
+        const = alpha * overlay + (1 - alpha) * edge_mask * bg
+        weight = (1 - alpha) * (1 - edge_mask)
+
+        if not weight.any():
+            return _StaticPlate(
+                region=(x1, y1, x2, y2),
+                const=np.clip(const + 0.5, 0, 255).astype(np.uint8),
+                weight=None,
+                blur_size=blur_size,
+            )
+        return _StaticPlate(region=(x1, y1, x2, y2), const=const, weight=weight, blur_size=blur_size)
+
+    def _composite_static(
+        self,
+        frame: np.ndarray,
+        segment_id: str,
+        asset: ReplacementAsset,
+        bbox: BoundingBox,
+        bg_color: tuple[int, int, int],
+    ) -> np.ndarray:
+        """
+        composite_frame for an untracked segment, reusing its precomposited plate.
+
+        Resize, mask and blend are done once per segment; later frames only
+        copy the plate and, for translucent assets, re-blur the original
+        region for the feathered edge band.
+        """
+        key = (segment_id, frame.shape[0], frame.shape[1])
+        plate = self._static_cache.get(key)
+        if plate is None:
+            plate = self._static_plate(frame, asset, bbox, bg_color)
+            if plate is None:
+                return frame  # Completely out of frame
+            self._static_cache[key] = plate
+
+        x1, y1, x2, y2 = plate.region
+        if plate.weight is None:
+            frame[y1:y2, x1:x2] = plate.const
         else:
-            frame[y1:y2, x1:x2] = overlay[:, :, :3]
+            blurred = _soft_blur(frame[y1:y2, x1:x2], plate.blur_size)
+            out = plate.const + plate.weight * blurred
+            np.clip(out + 0.5, 0, 255, out=out)
+            frame[y1:y2, x1:x2] = out.astype(np.uint8)
+        return frame
+
+    def _composite_segments(
+        self,
+        frame: np.ndarray,
+        jobs: list[tuple[str | None, ReplacementAsset, BoundingBox, tuple[int, int, int] | None]],
+    ) -> np.ndarray:
+        """
+        Composite every active (static_id, asset, bbox, bg_color) onto one frame, in order.
 
+        Jobs with a static_id (untracked segments with a known background)
+        go through the per-segment plate cache.
+        """
+        for static_id, asset, bbox, bg_color in jobs:
+            if static_id is not None and bg_color is not None:
+                frame = self._composite_static(frame, static_id, asset, bbox, bg_color)
+            else:
+                frame = self.composite_frame(
+                    frame, asset, bbox,
+                    fill_background=True,
+                    bg_color=bg_color,
+                )
         return frame
 
+    def _overlay_static_plates(
+        self,
+        video_path: Path,
+        segments: list[VisualSegment],
+        assets: dict[str, ReplacementAsset],
+        frame_size: tuple[int, int],
+        output_path: Path,
+        video_codec: dict,
+    ) -> Path | None:
+        """
+        Composite constant static plates with ffmpeg's overlay filter.
+
+        Applies only when every segment is untracked and its plate (built by
+        _presample_bg_colors) has no frame-dependent edge band, as with
+        opaque assets. The plate is then the exact composite for every
+        frame, so no frame has to pass through Python.
+
+        Returns None, meaning the caller should run the frame loop, when
+        any segment needs per-frame blending.
+        """
+        frame_h, frame_w = frame_size
+        plates = []
+        for segment in segments:
+            if segment.placeholder_key not in assets:
+                continue
+            plate = self._static_cache.get((segment.id, frame_h, frame_w))
+            if plate is None or plate.weight is not None:
+                return None
+            plates.append((segment, plate))
+        if not plates:
+            return None
+
+        logger.info(f"Compositing {len(plates)} static plate(s) with the ffmpeg overlay filter")
+
+        with tempfile.TemporaryDirectory(prefix="replacer_") as tmp:
+            overlays = []
+            for i, (segment, plate) in enumerate(plates):
+                x1, y1, _, _ = plate.region
+                plate_path = Path(tmp) / f"plate_{i:03d}.png"
+                cv2.imwrite(str(plate_path), plate.const)
+                overlays.append({
+                    "path": plate_path,
+                    "x": x1,
+                    "y": y1,
+                    "start_time": segment.start_time,
+                    "end_time": segment.end_time,
+                })
+
+            # Same output settings as the frame loop (CRF 18-class video, AAC
+            # audio), so the result doesn't depend on which path ran
+            # apply_multiple_overlays composites timed overlays on the CPU
+            use_cuda = (
+                all(o["start_time"] is None and o["end_time"] is None for o in overlays)
+                and detect_cuda_overlay(get_video_info(video_path).video_codec)
+            )
+            if use_cuda:
+                # overlay_cuda already emits yuv420p on the GPU
+                video_codec = {key: value for key, value in video_codec.items() if key != "pix_fmt"}
+            encoding_args = [
+                arg for key, value in video_codec.items() for arg in (f"-{key}", str(value))
+            ]
+            encoding_args += ["-c:a", "aac"]
+
+            FFmpegProcessor.apply_multiple_overlays(
+                video_path,
+                overlays,
+                output_path,
+                hw_accel="cuda" if use_cuda else None,
+                encoding_args=encoding_args,
+            )
+
+        return output_path
+
+    def _process_edit_windows(
+        self,
+        video_path: Path,
+        segments: list[VisualSegment],
+        assets: dict[str, ReplacementAsset],
+        output_path: Path,
+    ) -> Path | None:
+        """
+        Re-encode only the windows that contain segments; stream-copy the rest.
+
+        Windows are widened to keyframes so every cut lands on one, each
+        window is run through process_video on its own, and the pieces are
+        joined with the concat demuxer. Pieces are MPEG-TS so each carries
+        its own in-band H.264 parameter sets, and windows are encoded with
+        the source's profile, level and pix_fmt. Pieces are video-only; the
+        source's audio track is stream-copied whole onto the joined video.
+
+        Returns None, meaning the caller should re-encode the whole video,
+        when the source can't be spliced this way or the windows cover most
+        of it anyway.
+        """
+        try:
+            info = get_video_info(video_path)
+            keyframes = get_keyframe_times(video_path)
+            stream_params = get_video_stream_params(video_path)
+        except Exception as e:
+            logger.warning(f"Cannot splice {video_path}, re-encoding all frames: {e}")
+            return None
+
+        if info.video_codec != "h264" or info.audio_codec not in (None, "aac"):
+            return None
+        encoder_params = _splice_encoder_params(stream_params)
+        if encoder_params is None:
+            return None
+        if not keyframes or info.duration <= 0:
+            return None
+
+        windows = _edit_windows(segments, assets, keyframes, info.duration)
+        covered = sum(end - start for start, end in windows)
+        if not windows or covered > info.duration * _MAX_SPLICE_COVERAGE:
+            return None
+
+        logger.info(
+            f"Re-encoding {len(windows)} window(s) ({covered:.2f}s of {info.duration:.2f}s), "
+            f"stream-copying the rest"
+        )
+
+        with tempfile.TemporaryDirectory(prefix="replacer_") as tmp:
+            tmp_dir = Path(tmp)
+            pieces: list[Path] = []
+            cursor = 0.0
+
+            for i, (start, end) in enumerate(windows):
+                if start > cursor:
+                    pieces.append(FFmpegProcessor.extract_segment(
+                        video_path, cursor, start, tmp_dir / f"copy_{i:03d}.ts", video_only=True
+                    ))
+
+                clip = FFmpegProcessor.extract_segment(
+                    video_path, start, end, tmp_dir / f"window_{i:03d}_src.ts", video_only=True
+                )
+                # Segment times relative to the window clip
+                window_segments = [
+                    segment.model_copy(update={
+                        "start_time": segment.start_time - start,
+                        "end_time": segment.end_time - start,
+                    })
+                    for segment in segments
+                    if segment.start_time <= end and segment.end_time >= start
+                ]
+                pieces.append(self.process_video(
+                    clip, window_segments, assets, tmp_dir / f"window_{i:03d}.ts",
+                    encoder_params=encoder_params,
+                ))
+                cursor = end
+
+            if cursor < info.duration:
+                pieces.append(FFmpegProcessor.extract_segment(
+                    video_path, cursor, info.duration, tmp_dir / "copy_tail.ts", video_only=True
+                ))
+
+            if info.audio_codec is None:
+                FFmpegProcessor.concatenate_segments(pieces, output_path, reencode=False, video_only=True)
+            else:
+                joined = FFmpegProcessor.concatenate_segments(
+                    pieces, tmp_dir / "joined.mp4", reencode=False, video_only=True
+                )
+                run_ffmpeg([
+                    "-i", str(joined),
+                    "-i", str(video_path),
+                    "-map", "0:v", "-map", "1:a",
+                    "-c", "copy",
+                    "-movflags", "+faststart",
+                    str(output_path),
+                ], "Mux source audio onto spliced video")
+
+        logger.info(f"Visual replacement complete: {output_path}")
+        return output_path
+
     def process_video(
         self,
         video_path: Path,
         segments: list[VisualSegment],
         assets: dict[str, ReplacementAsset],
         output_path: Path,
+        stream_copy_untouched: bool = False,
+        encoder_params: dict | None = None,
     ) -> Path:
         """
         Process entire video, replacing all visual segments.
@@ -532,6 +1395,11 @@ class VisualReplacer:
             segments: List of visual segments to replace
             assets: Dict mapping placeholder_key to ReplacementAsset
             output_path: Where to save result
+            stream_copy_untouched: If True and the source can be spliced
+                (H.264 with AAC or no audio), only re-encode keyframe-aligned
+                windows around segments and stream-copy everything else
+            encoder_params: Extra output options (e.g. profile:v, level,
+                pix_fmt) merged over the default H.264 encoder settings
 
         Returns:
             Path to output video
@@ -539,6 +1407,13 @@ class VisualReplacer:
         video_path = Path(video_path)
         output_path = Path(output_path)
 
+        if stream_copy_untouched:
+            spliced = self._process_edit_windows(video_path, segments, assets, output_path)
+            if spliced is not None:
+                return spliced
+
+        video_codec = {"pix_fmt": "yuv420p", **_video_codec_kwargs(), **(encoder_params or {})}
+
         cap = cv2.VideoCapture(str(video_path))
         if not cap.isOpened():
             raise RuntimeError(f"Cannot open video: {video_path}")
@@ -550,7 +1425,6 @@ class VisualReplacer:
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
 
         # Use ffprobe to get accurate fps (OpenCV returns 1000 for WebM files)
-        from ..core.video_info import get_video_info
         try:
             video_info = get_video_info(video_path)
             fps = video_info.fps
@@ -583,9 +1457,10 @@ class VisualReplacer:
             f"{total_frames} frames"
         )
 
-        # Pre-compute tracking for segments that need it
+        # Pre-compute tracking for segments that need it, in time order so
+        # the tracker's cached capture mostly reads forward instead of seeking
         tracking_data = {}
-        for segment in segments:
+        for segment in sorted(segments, key=lambda s: s.start_time):
             if segment.tracking_reference_frame is not None:
                 bbox = BoundingBox(
                     x=segment.x,
@@ -599,118 +1474,162 @@ class VisualReplacer:
                 tracking_data[segment.id] = self.tracker.track_region(
                     video_path, bbox, start_frame, end_frame
                 )
+        self.tracker.close()
 
-        # Create temp file for frames
-        temp_dir = Path(tempfile.mkdtemp())
-        frames_pattern = temp_dir / "frame_%06d.png"
+        active_by_frame = self._build_active_table(segments, assets, tracking_data, fps)
 
-        # Cache for background colors (sampled from first frame where segment appears)
-        bg_colors: dict[str, tuple[int, int, int]] = {}
+        # Background colours, sampled up front from each segment's first frame
+        static_ids = {segment.id for segment in segments if segment.id not in tracking_data}
+        bg_colors = self._presample_bg_colors(cap, active_by_frame, static_ids)
 
-        # Process frames
-        frame_num = 0
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            current_time = frame_num / fps
-
-            # Apply each segment that's active at this time
-            for segment in segments:
-                if segment.start_time <= current_time <= segment.end_time:
-                    asset = assets.get(segment.placeholder_key)
-                    if asset is None:
-                        continue
-
-                    # Get bbox (static or tracked)
-                    if segment.id in tracking_data:
-                        # Find tracked position for this frame
-                        tracked_frames = tracking_data[segment.id]
-                        start_frame = int(segment.start_time * fps)
-                        idx = frame_num - start_frame
-
-                        if 0 <= idx < len(tracked_frames):
-                            bbox = tracked_frames[idx].bbox
-                        else:
-                            bbox = BoundingBox(
-                                x=segment.x, y=segment.y,
-                                width=segment.width, height=segment.height
-                            )
-                    else:
-                        # Static position
-                        bbox = BoundingBox(
-                            x=segment.x, y=segment.y,
-                            width=segment.width, height=segment.height
-                        )
-
-                    # Sample and cache background color on first appearance
-                    if segment.id not in bg_colors:
-                        bg_colors[segment.id] = self.sample_background_color(frame, bbox)
-                        logger.debug(f"Sampled background color for {segment.id}: RGB{bg_colors[segment.id]}")
-
-                    frame = self.composite_frame(
-                        frame, asset, bbox,
-                        fill_background=True,
-                        bg_color=bg_colors[segment.id]
-                    )
-
-            # Save frame
-            frame_path = str(frames_pattern) % frame_num
-            cv2.imwrite(frame_path, frame)
-            frame_num += 1
-
-        cap.release()
-
-        # Encode frames to video with FFmpeg, preserving audio from original
-        logger.info("Encoding output video")
+        if not tracking_data:
+            try:
+                overlaid = self._overlay_static_plates(
+                    video_path, segments, assets, (frame_height, frame_width), output_path, video_codec
+                )
+            except Exception:
+                cap.release()
+                raise
+            if overlaid is not None:
+                cap.release()
+                self._resize_cache.clear()
+                self._static_cache.clear()
+                logger.info(f"Visual replacement complete: {output_path}")
+                return overlaid
 
         # Check if original has audio
-        from ..core.video_info import get_video_info
         try:
             orig_info = get_video_info(video_path)
             has_audio = orig_info.audio_codec is not None
         except Exception:
             has_audio = False
 
+        # Stream composited frames straight into the encoder as raw BGR24,
+        # preserving audio from the original
+        frames_input = ffmpeg_lib.input(
+            "pipe:",
+            format="rawvideo",
+            pix_fmt="bgr24",
+            s=f"{frame_width}x{frame_height}",
+            framerate=fps,
+        )
         if has_audio:
-            # Combine new video frames with original audio
-            frames_input = ffmpeg_lib.input(str(temp_dir / "frame_%06d.png"), framerate=fps)
             audio_input = ffmpeg_lib.input(str(video_path)).audio
-
-            (
-                ffmpeg_lib
-                .output(
-                    frames_input,
-                    audio_input,
-                    str(output_path),
-                    vcodec="libx264",
-                    acodec="aac",
-                    crf=18,
-                    pix_fmt="yuv420p",
-                    shortest=None,  # End when shortest stream ends
-                )
-                .overwrite_output()
-                .run(quiet=True)
+            output = ffmpeg_lib.output(
+                frames_input,
+                audio_input,
+                str(output_path),
+                acodec="aac",
+                shortest=None,  # End when shortest stream ends
+                **video_codec,
             )
         else:
-            # No audio, just encode video
-            (
-                ffmpeg_lib
-                .input(str(temp_dir / "frame_%06d.png"), framerate=fps)
-                .output(
-                    str(output_path),
-                    vcodec="libx264",
-                    crf=18,
-                    pix_fmt="yuv420p",
-                )
-                .overwrite_output()
-                .run(quiet=True)
+            output = ffmpeg_lib.output(
+                frames_input,
+                str(output_path),
+                **video_codec,
             )
 
-        # Clean up temp frames
-        import shutil
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        # stderr is left unpiped (but quieted) so a chatty encoder can't
+        # fill the pipe buffer and stall the writer
+        proc = (
+            output
+            .global_args("-loglevel", "error", "-nostats")
+            .overwrite_output()
+            .run_async(pipe_stdin=True)
+        )
+
+        # Decode and bbox/bg-colour bookkeeping stay on this thread; the
+        # compositing itself (OpenCV/NumPy, which release the GIL) fans out to
+        # a small pool, and a writer thread feeds results to the encoder in
+        # decode order. At most max_in_flight frames are held at once.
+        workers = _COMPOSITE_WORKERS
+        max_in_flight = workers * 2
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="composite")
+        pending: queue.Queue = queue.Queue(maxsize=max_in_flight)
+        write_errors: list[BaseException] = []
+        writer = threading.Thread(
+            target=_encode_frames,
+            args=(pending, proc.stdin, write_errors),
+            name="replacer-encode",
+            daemon=True,
+        )
+        writer.start()
+
+        # Decode with PyAV's threaded decoder when available; cap stays open
+        # for the properties and seeks above either way
+        read_frame, close_reader = cap.read, None
+        if AV_AVAILABLE:
+            try:
+                read_frame, close_reader = _open_av_reader(video_path)
+            except Exception as e:
+                logger.warning(f"PyAV could not open {video_path}: {e}, using OpenCV decode")
+
+        # Decode on a background thread so H.264 decode overlaps compositing
+        frame_queue: queue.Queue = queue.Queue(maxsize=_DECODE_QUEUE_SIZE)
+        stop_decoding = threading.Event()
+        decoder = threading.Thread(
+            target=_decode_frames,
+            args=(read_frame, frame_queue, stop_decoding),
+            name="replacer-decode",
+            daemon=True,
+        )
+        decoder.start()
+
+        # Process frames
+        frame_num = 0
+        try:
+            while not write_errors:
+                ret, frame = frame_queue.get()
+                if not ret:
+                    if isinstance(frame, Exception):
+                        raise RuntimeError(f"Decoding {video_path} failed: {frame}") from frame
+                    break
+
+                jobs: list[tuple[str | None, ReplacementAsset, BoundingBox, tuple[int, int, int] | None]] = []
+
+                # Apply each segment that's active on this frame
+                active = active_by_frame[frame_num] if frame_num < len(active_by_frame) else ()
+                for segment, asset, bbox in active:
+                    static_id = segment.id if segment.id in static_ids else None
+                    jobs.append((static_id, asset, bbox, bg_colors.get(segment.id)))
+
+                # Untouched frames skip the pool and go straight to the writer.
+                # Blocks once max_in_flight frames are queued.
+                if jobs:
+                    pending.put(pool.submit(self._composite_segments, frame, jobs))
+                else:
+                    passthrough = Future()
+                    passthrough.set_result(frame)
+                    pending.put(passthrough)
+                frame_num += 1
+        finally:
+            pending.put(None)
+            writer.join()
+            pool.shutdown(wait=True, cancel_futures=True)
+            stop_decoding.set()
+            decoder.join()
+            if close_reader is not None:
+                close_reader()
+            cap.release()
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode = proc.wait()
+
+        # A broken pipe means the encoder exited early; its return code is
+        # checked below. Anything else came from compositing.
+        if write_errors and not isinstance(write_errors[0], BrokenPipeError):
+            raise write_errors[0]
+
+        self._resize_cache.clear()
+        self._static_cache.clear()
+
+        if returncode != 0:
+            raise RuntimeError(
+                f"FFmpeg encode failed for {output_path} (exit code {returncode})"
+            )
 
         logger.info(f"Visual replacement complete: {output_path}")
         return output_path
@@ -5,13 +5,114 @@ Tracks regions across frames so replacements follow movement.
 Uses OpenCV's tracking algorithms.
 """
 
+import heapq
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 from pathlib import Path
 from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Callable
 from loguru import logger
 
 
+# Decoded frames buffered ahead of the tracker (bounds memory to N frames)
+_PREFETCH_FRAMES = 8
+
+# A cached capture up to this many frames behind the requested start reads
+# forward to it instead of seeking (a seek decodes from the previous keyframe)
+_MAX_GRAB_AHEAD = 120
+
+# FLANN locality-sensitive hashing index, for binary (ORB) descriptors
+_FLANN_INDEX_LSH = 6
+
+# Lowe's ratio: best match must beat the second best by this factor
+_RATIO_TEST = 0.75
+
+# ORB for frame-to-frame homographies: a coarser, shallower pyramid than
+# OpenCV's default (1.2, 8 levels) roughly halves detection work, which
+# short-baseline tracking doesn't need
+_ORB_PARAMS = dict(nfeatures=500, scaleFactor=1.3, nlevels=4, fastThreshold=20)
+
+# Below this many keypoints the next frame is detected with a lower FAST
+# threshold, so texture-poor scenes still yield enough to match
+_ORB_MIN_FEATURES = 100
+_ORB_LOW_FAST_THRESHOLD = 10
+
+# A hybrid-mode KCF box whose centre moves more than this fraction of the
+# box size in one frame is treated as a lost target and re-detected
+_HYBRID_MAX_SHIFT = 0.5
+
+
+def _cuda_available() -> bool:
+    """Check whether this OpenCV build can run CUDA kernels on a device."""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+def _open_video(video_path: Path) -> cv2.VideoCapture:
+    """
+    Open a video through OpenCV's FFmpeg backend with hardware decode if any.
+
+    VIDEO_ACCELERATION_ANY picks NVDEC / VA-API / VideoToolbox / D3D11 when
+    present and quietly decodes in software otherwise. Builds without the
+    params constructor (OpenCV < 4.5.2) get the default backend.
+    """
+    try:
+        cap = cv2.VideoCapture(
+            str(video_path),
+            cv2.CAP_FFMPEG,
+            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+        )
+        if cap.isOpened():
+            return cap
+        cap.release()
+    except (AttributeError, TypeError, cv2.error):
+        pass
+    return cv2.VideoCapture(str(video_path))
+
+
+def _read_frames(
+    cap: cv2.VideoCapture,
+    count: int,
+    frames: queue.Queue,
+    stop: threading.Event,
+    process: Callable[[np.ndarray], Any] | None = None,
+) -> None:
+    """Read up to count frames from cap into a bounded queue.
+
+    Items follow cap.read's (ret, frame) contract and always end with a
+    (False, None) sentinel unless stopped first; if cap.read raises, the
+    sentinel carries the exception instead of None. With process, each
+    frame is replaced by process(frame), run on the reading thread.
+    """
+    remaining = count
+    while not stop.is_set():
+        if remaining > 0:
+            try:
+                ret, frame = cap.read()
+                if ret and process is not None:
+                    frame = process(frame)
+            except Exception as e:
+                ret, frame = False, e
+            remaining -= 1
+        else:
+            ret, frame = False, None
+        item = (ret, frame if ret or isinstance(frame, Exception) else None)
+        while not stop.is_set():
+            try:
+                frames.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        if not ret:
+            return
+
+
 @dataclass
 class BoundingBox:
     """A bounding box with normalized coordinates (0-1 range).
@@ -66,20 +167,173 @@ class TrackedFrame:
     confidence: float
 
 
+class TrackedFrames:
+    """
+    Tracking results for a run of frames, stored column-wise.
+
+    Behaves like a list of TrackedFrame (len, indexing, iteration), building
+    each TrackedFrame on access; boxes holds every frame's normalized
+    x, y, width, height as one (N, 4) array for vectorized consumers.
+    """
+
+    def __init__(self, frame_numbers: np.ndarray, boxes: np.ndarray, confidence: np.ndarray):
+        self.frame_numbers = frame_numbers  # int64 (N,)
+        self.boxes = boxes                  # float64 (N, 4)
+        self.confidence = confidence        # float64 (N,)
+
+    @classmethod
+    def concat(cls, parts: list["TrackedFrames"]) -> "TrackedFrames":
+        """Join consecutive runs into one."""
+        return cls(
+            np.concatenate([p.frame_numbers for p in parts]),
+            np.concatenate([p.boxes for p in parts]),
+            np.concatenate([p.confidence for p in parts]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.frame_numbers)
+
+    def __getitem__(self, idx: int) -> TrackedFrame:
+        x, y, width, height = self.boxes[idx].tolist()
+        return TrackedFrame(
+            frame_number=int(self.frame_numbers[idx]),
+            bbox=BoundingBox(x=x, y=y, width=width, height=height),
+            confidence=float(self.confidence[idx]),
+        )
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+
+class _HybridTracker:
+    """
+    KCF on every frame, re-detected with CSRT when KCF loses the target.
+
+    Follows the OpenCV tracker init/update interface. KCF's box is accepted
+    while its update succeeds and the box doesn't jump (see
+    _HYBRID_MAX_SHIFT). Otherwise CSRT is seeded on the previous frame at
+    the last accepted box and stepped to the current one, so the motion it
+    has to find is a single frame's, and KCF is re-seeded from its result.
+    """
+
+    def __init__(self):
+        self._kcf = None
+        self._prev_frame = None
+        self._prev_bbox = None
+
+    def init(self, frame: np.ndarray, bbox: tuple[int, int, int, int]) -> None:
+        self._kcf = cv2.TrackerKCF_create()
+        self._kcf.init(frame, bbox)
+        self._prev_frame = frame
+        self._prev_bbox = tuple(int(v) for v in bbox)
+
+    def _jumped(self, bbox: tuple[int, int, int, int]) -> bool:
+        px, py, pw, ph = self._prev_bbox
+        x, y, w, h = bbox
+        dx = (x + w / 2) - (px + pw / 2)
+        dy = (y + h / 2) - (py + ph / 2)
+        return abs(dx) > pw * _HYBRID_MAX_SHIFT or abs(dy) > ph * _HYBRID_MAX_SHIFT
+
+    def update(self, frame: np.ndarray) -> tuple[bool, tuple[int, int, int, int]]:
+        ok, bbox = self._kcf.update(frame)
+        if ok and not self._jumped(bbox):
+            self._prev_frame = frame
+            self._prev_bbox = tuple(int(v) for v in bbox)
+            return ok, bbox
+
+        csrt = cv2.TrackerCSRT_create()
+        csrt.init(self._prev_frame, self._prev_bbox)
+        ok, bbox = csrt.update(frame)
+        bbox = tuple(int(v) for v in bbox)
+        if not ok or bbox[2] <= 0 or bbox[3] <= 0:
+            # Lost: hold the last accepted box and retry from it next frame
+            self._kcf = cv2.TrackerKCF_create()
+            self._kcf.init(frame, self._prev_bbox)
+            self._prev_frame = frame
+            return False, self._prev_bbox
+
+        self.init(frame, bbox)
+        return ok, bbox
+
+
 class MotionTracker:
     """
     Track a region across video frames.
 
     Uses CSRT tracker for accuracy (best for our use case).
-    Falls back to KCF for speed if needed.
+    Falls back to KCF for speed if needed, or "hybrid" (KCF, re-detected
+    with CSRT when it loses the target) for long ranges.
     """
 
     def __init__(self, algorithm: str = "csrt"):
         """
         Args:
-            algorithm: "csrt" (accurate) or "kcf" (fast)
+            algorithm: "csrt" (accurate), "kcf" (fast) or "hybrid". Hybrid
+                runs at close to KCF speed but is less accurate than csrt:
+                CSRT only steps in when KCF fails or its box jumps, so
+                gradual KCF drift and KCF's fixed box size go uncorrected.
         """
         self.algorithm = algorithm
+        # Open captures by video path with their next frame number, reused
+        # by the next call on the same video; see close()
+        self._cap_cache: dict[str, tuple[cv2.VideoCapture, int]] = {}
+        self._cap_lock = threading.Lock()
+        # ORB feature extraction for homography tracking runs on the GPU
+        # when OpenCV was built with CUDA
+        self._use_cuda_orb = _cuda_available()
+        if self._use_cuda_orb:
+            logger.info("CUDA available - ORB features will be extracted on the GPU")
+
+    def _open_capture(self, video_path: Path, start_frame: int) -> cv2.VideoCapture:
+        """
+        Return a capture whose next read is start_frame.
+
+        Reuses the cached capture for video_path when it is at or a little
+        before start_frame, reading forward rather than seeking. Captures are
+        checked out of the cache, so concurrent calls never share one.
+        """
+        with self._cap_lock:
+            cached = self._cap_cache.pop(str(video_path), None)
+
+        if cached is None:
+            cap = _open_video(video_path)
+            if not cap.isOpened():
+                raise RuntimeError(f"Cannot open video: {video_path}")
+            pos = 0
+        else:
+            cap, pos = cached
+
+        if pos <= start_frame < pos + _MAX_GRAB_AHEAD:
+            for _ in range(start_frame - pos):
+                if not cap.grab():
+                    break
+        else:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        return cap
+
+    def _return_capture(self, video_path: Path, cap: cv2.VideoCapture) -> None:
+        """Cache cap for the next call on video_path, where its reading stopped."""
+        pos = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        with self._cap_lock:
+            previous = self._cap_cache.pop(str(video_path), None)
+            self._cap_cache[str(video_path)] = (cap, pos)
+        if previous is not None:
+            previous[0].release()
+
+    def close(self):
+        """Release any cached video captures."""
+        with self._cap_lock:
+            cached = list(self._cap_cache.values())
+            self._cap_cache.clear()
+        for cap, _ in cached:
+            cap.release()
+
+    def __enter__(self) -> "MotionTracker":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def _create_tracker(self):
         """Create OpenCV tracker instance."""
@@ -87,6 +341,8 @@ class MotionTracker:
             return cv2.TrackerCSRT_create()
         elif self.algorithm == "kcf":
             return cv2.TrackerKCF_create()
+        elif self.algorithm == "hybrid":
+            return _HybridTracker()
         else:
             raise ValueError(f"Unknown algorithm: {self.algorithm}")
 
@@ -96,7 +352,7 @@ class MotionTracker:
         initial_bbox: BoundingBox,
         start_frame: int = 0,
         end_frame: int = None,
-    ) -> list[TrackedFrame]:
+    ) -> TrackedFrames:
         """
         Track a region through a video.
 
@@ -107,13 +363,10 @@ class MotionTracker:
             end_frame: Frame to stop (None = end of video)
 
         Returns:
-            List of TrackedFrame for each frame
+            TrackedFrames with a TrackedFrame for each frame
         """
         video_path = Path(video_path)
-        cap = cv2.VideoCapture(str(video_path))
-
-        if not cap.isOpened():
-            raise RuntimeError(f"Cannot open video: {video_path}")
+        cap = self._open_capture(video_path, start_frame)
 
         frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -126,10 +379,9 @@ class MotionTracker:
             f"Tracking region from frame {start_frame} to {end_frame}"
         )
 
-        # Seek to start frame
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
         ret, frame = cap.read()
         if not ret:
+            cap.release()
             raise RuntimeError(f"Cannot read frame {start_frame}")
 
         # Initialize tracker with first frame
@@ -137,44 +389,123 @@ class MotionTracker:
         bbox_pixels = initial_bbox.to_pixels(frame_width, frame_height)
         tracker.init(frame, bbox_pixels)
 
-        results = [
-            TrackedFrame(
-                frame_number=start_frame,
-                bbox=initial_bbox,
-                confidence=1.0,
-            )
-        ]
+        # Decode on a background thread so reading the next frame overlaps
+        # tracker.update, which is stateful and stays on this thread
+        frames: queue.Queue = queue.Queue(maxsize=_PREFETCH_FRAMES)
+        stop_reading = threading.Event()
+        reader = threading.Thread(
+            target=_read_frames,
+            args=(cap, end_frame - start_frame - 1, frames, stop_reading),
+            name="tracker-decode",
+            daemon=True,
+        )
+        reader.start()
+
+        # Raw pixel boxes for the remaining frames, normalised in one pass
+        # once tracking is done
+        pixel_boxes = np.empty((max(end_frame - start_frame - 1, 0), 4), dtype=np.float64)
+        found = np.zeros(len(pixel_boxes), dtype=bool)
+        count = 0
 
         # Track through remaining frames
-        for frame_num in range(start_frame + 1, end_frame):
-            ret, frame = cap.read()
-            if not ret:
-                break
+        try:
+            for frame_num in range(start_frame + 1, end_frame):
+                ret, frame = frames.get()
+                if not ret:
+                    if isinstance(frame, Exception):
+                        raise RuntimeError(f"Decoding {video_path} failed: {frame}") from frame
+                    break
+
+                success, bbox = tracker.update(frame)
+
+                if success:
+                    pixel_boxes[count] = bbox
+                    found[count] = True
+                else:
+                    logger.warning(f"Tracking lost at frame {frame_num}")
+                count += 1
+        finally:
+            stop_reading.set()
+            reader.join()
+            self._return_capture(video_path, cap)
+
+        # First frame is the caller's box; the rest are truncated to whole
+        # pixels as before, then normalised
+        scale = np.array([frame_width, frame_height, frame_width, frame_height], dtype=np.float64)
+        boxes = np.empty((count + 1, 4), dtype=np.float64)
+        boxes[0] = (initial_bbox.x, initial_bbox.y, initial_bbox.width, initial_bbox.height)
+        boxes[1:] = np.trunc(pixel_boxes[:count]) / scale
+
+        # Tracking lost - keep last known position
+        found = np.concatenate(([True], found[:count]))
+        last_found = np.maximum.accumulate(np.where(found, np.arange(count + 1), 0))
+
+        results = TrackedFrames(
+            frame_numbers=np.arange(start_frame, start_frame + count + 1),
+            boxes=boxes[last_found],
+            confidence=found.astype(np.float64),
+        )
 
-            success, bbox = tracker.update(frame)
+        logger.info(f"Tracking complete: {len(results)} frames")
+        return results
 
-            if success:
-                x, y, w, h = [int(v) for v in bbox]
-                tracked_bbox = BoundingBox.from_pixels(
-                    x, y, w, h, frame_width, frame_height
-                )
-                confidence = 1.0
-            else:
-                # Tracking lost - use last known position
-                tracked_bbox = results[-1].bbox
-                confidence = 0.0
-                logger.warning(f"Tracking lost at frame {frame_num}")
-
-            results.append(
-                TrackedFrame(
-                    frame_number=frame_num,
-                    bbox=tracked_bbox,
-                    confidence=confidence,
-                )
+    def track_region_parallel(
+        self,
+        video_path: Path,
+        initial_bbox: BoundingBox,
+        start_frame: int = 0,
+        end_frame: int = None,
+        n_jobs: int = 4,
+        window: int = 500,
+    ) -> TrackedFrames:
+        """
+        Track a region by splitting the range into windows tracked in parallel.
+
+        A fast KCF pass over the whole range first gives a seed bbox at each
+        window boundary; each window is then re-tracked with this tracker's
+        algorithm on its own capture, in a thread pool (OpenCV releases the
+        GIL). Smaller windows parallelise better, larger ones drift less at
+        the seams.
+
+        Args:
+            video_path: Path to video file
+            initial_bbox: Starting bounding box (relative coords)
+            start_frame: Frame to start tracking
+            end_frame: Frame to stop (None = end of video)
+            n_jobs: Windows tracked at once
+            window: Frames per window
+
+        Returns:
+            TrackedFrames for each frame, as from track_region
+        """
+        coarse_tracker = MotionTracker("kcf")
+        try:
+            coarse = coarse_tracker.track_region(
+                video_path, initial_bbox, start_frame, end_frame
             )
+        finally:
+            coarse_tracker.close()
+        # The coarse pass stops at the real end of the video; its first
+        # entry is initial_bbox, so window 0 starts from the caller's box
+        end_frame = start_frame + len(coarse)
+
+        windows = [
+            (coarse[w_start - start_frame].bbox, w_start, min(w_start + window, end_frame))
+            for w_start in range(start_frame, end_frame, window)
+        ]
+        if len(windows) == 1 or n_jobs <= 1:
+            return self.track_region(video_path, initial_bbox, start_frame, end_frame)
 
-        cap.release()
-        logger.info(f"Tracking complete: {len(results)} frames")
+        logger.info(f"Tracking {len(windows)} windows of {window} frames with {n_jobs} workers")
+
+        with ThreadPoolExecutor(max_workers=n_jobs, thread_name_prefix="tracker") as executor:
+            tracked = executor.map(
+                lambda args: self.track_region(video_path, *args),
+                windows,
+            )
+            results = TrackedFrames.concat(list(tracked))
+
+        logger.info(f"Parallel tracking complete: {len(results)} frames")
         return results
 
     def track_with_homography(
@@ -183,6 +514,7 @@ class MotionTracker:
         corner_points: list[tuple[float, float]],
         start_frame: int = 0,
         end_frame: int = None,
+        detect_scale: float = 0.5,
     ) -> list[np.ndarray]:
         """
         Track using feature-based homography.
@@ -195,12 +527,14 @@ class MotionTracker:
             corner_points: 4 corner points defining the region (relative 0-1)
             start_frame: Starting frame
             end_frame: Ending frame
+            detect_scale: Scale frames by this before ORB (1.0 = full
+                resolution); homographies are still in full-resolution pixels
 
         Returns:
             List of 3x3 homography matrices, one per frame
         """
         video_path = Path(video_path)
-        cap = cv2.VideoCapture(str(video_path))
+        cap = self._open_capture(video_path, start_frame)
 
         frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -216,61 +550,149 @@ class MotionTracker:
         ])
 
         # Initialize feature detector
-        orb = cv2.ORB_create(nfeatures=500)
-        bf = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
+        if self._use_cuda_orb:
+            orb = cv2.cuda_ORB.create(**_ORB_PARAMS)
+            matcher = cv2.cuda.DescriptorMatcher_createBFMatcher(cv2.NORM_HAMMING)
+            gpu_gray = cv2.cuda_GpuMat()
+
+            def detect_and_compute(gray: np.ndarray):
+                # Keypoints come back on the host, descriptors stay on the GPU
+                gpu_gray.upload(gray)
+                return orb.detectAndCompute(gpu_gray, None)
+        else:
+            orb = cv2.ORB_create(**_ORB_PARAMS)
+            # LSH index over the binary ORB descriptors instead of an
+            # exhaustive cross-checked Hamming match
+            matcher = cv2.FlannBasedMatcher(
+                dict(algorithm=_FLANN_INDEX_LSH, table_number=6, key_size=12, multi_probe_level=1),
+                dict(checks=50),
+            )
+
+            def detect_and_compute(gray: np.ndarray):
+                return orb.detectAndCompute(gray, None)
+
+        def detect(gray: np.ndarray):
+            kp, desc = detect_and_compute(gray)
+            # Adapt the FAST threshold for the next frame to this one's texture
+            orb.setFastThreshold(
+                _ORB_LOW_FAST_THRESHOLD if len(kp) < _ORB_MIN_FEATURES
+                else _ORB_PARAMS["fastThreshold"]
+            )
+            return kp, desc
 
         # Read first frame
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
         ret, prev_frame = cap.read()
         if not ret:
+            cap.release()
             raise RuntimeError(f"Cannot read frame {start_frame}")
 
-        prev_gray = cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY)
-        prev_kp, prev_desc = orb.detectAndCompute(prev_gray, None)
+        # Scratch buffers reused for every frame: detection only reads them
+        # and neither keypoints nor descriptors keep a reference. After the
+        # first frame only the extractor thread uses them.
+        detect_size = (
+            max(1, round(frame_width * detect_scale)),
+            max(1, round(frame_height * detect_scale)),
+        )
+        gray_buf = np.empty((frame_height, frame_width), dtype=np.uint8)
+        small_buf = np.empty((detect_size[1], detect_size[0]), dtype=np.uint8)
+
+        def to_gray(frame: np.ndarray) -> np.ndarray:
+            # OpenCV reallocates (and returns) a new array if a frame's size
+            # ever differs from the buffer's
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray_buf)
+            if detect_scale < 1.0:
+                # ORB cost grows with pixel count; INTER_AREA keeps corners clean
+                gray = cv2.resize(
+                    gray, detect_size, dst=small_buf,
+                    interpolation=cv2.INTER_AREA,
+                )
+            return gray
+
+        def extract(frame: np.ndarray) -> tuple[np.ndarray, Any] | None:
+            """Keypoint coordinates and descriptors, or None if too few to match."""
+            kp, desc = detect(to_gray(frame))
+            if desc is None or len(kp) < 4:
+                return None
+            return cv2.KeyPoint_convert(kp) / detect_scale, desc
+
+        prev_kp, prev_desc = detect(to_gray(prev_frame))
+        # Keypoint coordinates as an (N, 2) array in full-resolution pixels,
+        # gathered by match index below
+        prev_kp_xy = (
+            cv2.KeyPoint_convert(prev_kp) / detect_scale
+            if prev_kp else np.empty((0, 2), np.float32)
+        )
 
         # Identity matrix for first frame
         homographies = [np.eye(3, dtype=np.float32)]
 
         cumulative_H = np.eye(3, dtype=np.float32)
 
-        for frame_num in range(start_frame + 1, end_frame):
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            kp, desc = orb.detectAndCompute(gray, None)
-
-            if desc is None or len(kp) < 4:
-                # Not enough features - use last homography
-                homographies.append(cumulative_H.copy())
-                continue
-
-            # Match features
-            matches = bf.match(prev_desc, desc)
-            matches = sorted(matches, key=lambda x: x.distance)[:50]
-
-            if len(matches) < 4:
-                homographies.append(cumulative_H.copy())
-                continue
-
-            # Get matched points
-            src_pts = np.float32([prev_kp[m.queryIdx].pt for m in matches])
-            dst_pts = np.float32([kp[m.trainIdx].pt for m in matches])
-
-            # Find homography
-            H, mask = cv2.findHomography(src_pts, dst_pts, cv2.RANSAC, 5.0)
+        # Decode and ORB run ahead on a background thread (the only user of
+        # the detector from here on) while this thread matches and solves
+        features: queue.Queue = queue.Queue(maxsize=2)
+        stop_extracting = threading.Event()
+        extractor = threading.Thread(
+            target=_read_frames,
+            args=(cap, end_frame - start_frame - 1, features, stop_extracting, extract),
+            name="tracker-orb",
+            daemon=True,
+        )
+        extractor.start()
+
+        try:
+            for frame_num in range(start_frame + 1, end_frame):
+                ret, extracted = features.get()
+                if not ret:
+                    if isinstance(extracted, Exception):
+                        raise RuntimeError(f"Feature extraction failed on {video_path}: {extracted}") from extracted
+                    break
+
+                if extracted is None:
+                    # Not enough features - use last homography
+                    homographies.append(cumulative_H.copy())
+                    continue
+                kp_xy, desc = extracted
+
+                # Match features, keeping those that pass Lowe's ratio test
+                # (LSH may return fewer than two candidates for a descriptor)
+                pairs = matcher.knnMatch(prev_desc, desc, k=2)
+                matches = [
+                    pair[0] for pair in pairs
+                    if len(pair) == 2 and pair[0].distance < _RATIO_TEST * pair[1].distance
+                ]
+                # Partial selection of the 50 best (same result as a full sort)
+                matches = heapq.nsmallest(50, matches, key=attrgetter("distance"))
+
+                if len(matches) < 4:
+                    homographies.append(cumulative_H.copy())
+                    continue
+
+                # Get matched points
+                query_idx = np.fromiter((m.queryIdx for m in matches), np.intp, len(matches))
+                train_idx = np.fromiter((m.trainIdx for m in matches), np.intp, len(matches))
+                src_pts = prev_kp_xy[query_idx]
+                dst_pts = kp_xy[train_idx]
+
+                # Find homography (USAC MAGSAC rejects degenerate samples before
+                # solving, and scores inliers better than plain RANSAC)
+                H, mask = cv2.findHomography(
+                    src_pts, dst_pts, cv2.USAC_MAGSAC, 5.0,
+                    maxIters=2000, confidence=0.995,
+                )
 
-            if H is not None:
-                cumulative_H = H @ cumulative_H
-                homographies.append(cumulative_H.copy())
-            else:
-                homographies.append(cumulative_H.copy())
+                if H is not None:
+                    cumulative_H = H @ cumulative_H
+                    homographies.append(cumulative_H.copy())
+                else:
+                    homographies.append(cumulative_H.copy())
 
-            # Update for next iteration
-            prev_gray = gray
-            prev_kp = kp
-            prev_desc = desc
+                # Update for next iteration
+                prev_kp_xy = kp_xy
+                prev_desc = desc
+        finally:
+            stop_extracting.set()
+            extractor.join()
+            self._return_capture(video_path, cap)
 
-        cap.release()
         return homographies
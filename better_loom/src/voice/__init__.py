@@ -4,6 +4,6 @@ Voice Module
 Uses ElevenLabs for voice cloning and text-to-speech with proper audio timing.
 """
 
-from .client import VoiceClient, get_voice_client, generate_for_segment
+from .client import VoiceClient, get_voice_client, generate_for_segment, prewarm
 
-__all__ = ["VoiceClient", "get_voice_client", "generate_for_segment"]
+__all__ = ["VoiceClient", "get_voice_client", "generate_for_segment", "prewarm"]
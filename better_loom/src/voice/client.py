@@ -5,17 +5,25 @@ Handles voice cloning and text-to-speech with proper audio timing.
 Supports both IVC (Instant) and PVC (Professional) voice cloning.
 """
 
+import asyncio
 import os
 import hashlib
+import json
+import sqlite3
 import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from loguru import logger
 from typing import Optional, Literal
 
+import httpx
 from elevenlabs.client import ElevenLabs
 from elevenlabs import VoiceSettings
 
-from ..core.ffmpeg_utils import FFmpegProcessor
+from ..core.ffmpeg_utils import FFmpegProcessor, reflink_or_copy
 from ..core.video_info import get_audio_duration
 
 
@@ -24,6 +32,32 @@ from ..core.video_info import get_audio_duration
 _tts_cache: dict[str, tuple[Path, float]] = {}
 _tts_cache_dir: Optional[Path] = None
 
+# Files in the cache dir are also recorded in an sqlite index there, so a
+# new process picks up earlier generations instead of calling the API again
+_TTS_INDEX_NAME = "index.sqlite"
+_TTS_CACHE_MAX_BYTES = 2 * 1024**3  # least recently used entries are evicted past this
+_tts_index_loaded = False
+_tts_index_lock = threading.Lock()
+# Cache hits since the last index write: key -> time of use. Flushed with
+# the next write so a hit never costs an sqlite transaction of its own
+_tts_index_hits: dict[str, float] = {}
+
+# ElevenLabs recommended defaults for natural speech
+_VOICE_SETTINGS = {
+    "stability": 0.5,  # 0.5 = balanced (lower=expressive, higher=monotone)
+    "similarity_boost": 0.75,  # 0.75 = good match without artifacts
+    "style": 0.0,  # MUST be 0 - any higher causes instability/artifacts
+    "use_speaker_boost": True,  # Enhanced clarity
+}
+
+# How long list_voices reuses its last response, in seconds
+_VOICES_CACHE_TTL = 60.0
+
+# Time-stretch workers for generate_for_segments. Shared and never shut
+# down, so an async caller never blocks its event loop waiting on the pool;
+# threads are only started on first use
+_stretch_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="tts-stretch")
+
 
 def _get_tts_cache_dir() -> Path:
     """Get or create the TTS cache directory."""
@@ -34,10 +68,119 @@ def _get_tts_cache_dir() -> Path:
     return _tts_cache_dir
 
 
-def _get_cache_key(text: str, voice_id: str) -> str:
-    """Generate cache key from text and voice_id."""
-    content = f"{voice_id}:{text}"
-    return hashlib.sha256(content.encode()).hexdigest()[:16]
+def _connect_tts_index() -> sqlite3.Connection:
+    """Open the TTS cache index, creating or migrating its table if needed."""
+    # Short-lived connections keep this safe across threads and processes
+    conn = sqlite3.connect(_get_tts_cache_dir() / _TTS_INDEX_NAME, timeout=10.0)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS entries ("
+        "key TEXT PRIMARY KEY, path TEXT, duration REAL, size INTEGER, created REAL, used REAL)"
+    )
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+    if "used" not in columns:
+        # Index written before LRU eviction: last use defaults to creation time
+        with conn:
+            conn.execute("ALTER TABLE entries ADD COLUMN used REAL")
+            conn.execute("UPDATE entries SET used = created")
+    return conn
+
+
+def _load_tts_index() -> None:
+    """Populate _tts_cache from the on-disk index, once per process."""
+    global _tts_index_loaded
+    with _tts_index_lock:
+        if _tts_index_loaded:
+            return
+        _tts_index_loaded = True
+        try:
+            conn = _connect_tts_index()
+            try:
+                rows = conn.execute("SELECT key, path, duration FROM entries").fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"TTS cache index unreadable, starting empty: {e}")
+            return
+        for key, path, duration in rows:
+            _tts_cache.setdefault(key, (Path(path), duration))
+        logger.debug(f"Loaded {len(rows)} TTS cache entries from index")
+
+
+def _store_tts_index(key: str, path: Path, duration: float) -> None:
+    """Record a cache-dir file in the index and evict LRU entries past the size cap."""
+    with _tts_index_lock:
+        hits = [(used, hit_key) for hit_key, used in _tts_index_hits.items()]
+        _tts_index_hits.clear()
+    try:
+        conn = _connect_tts_index()
+        try:
+            with conn:
+                now = time.time()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, str(path), duration, path.stat().st_size, now, now),
+                )
+                conn.executemany("UPDATE entries SET used = ? WHERE key = ?", hits)
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                if total <= _TTS_CACHE_MAX_BYTES:
+                    return
+                evicted = []
+                for old_key, old_path, size in conn.execute(
+                    "SELECT key, path, size FROM entries ORDER BY used"
+                ).fetchall():
+                    if total <= _TTS_CACHE_MAX_BYTES:
+                        break
+                    evicted.append((old_key,))
+                    _tts_cache.pop(old_key, None)
+                    Path(old_path).unlink(missing_ok=True)
+                    total -= size
+                conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+                logger.debug(f"Evicted {len(evicted)} TTS cache entries")
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Failed to update TTS cache index: {e}")
+
+
+def _get_cache_key(
+    text: str,
+    voice_id: str,
+    model_id: str,
+    output_format: str,
+    **context,
+) -> str:
+    """
+    Generate cache key from everything that changes the generated audio.
+
+    Covers text, voice, model, output format and voice settings, plus any
+    prosody context (previous_text, next_text, previous_request_ids) that
+    is set. Serialised as sorted JSON so the key is deterministic.
+    """
+    content = json.dumps(
+        {
+            "text": text,
+            "voice_id": voice_id,
+            "model_id": model_id,
+            "output_format": output_format,
+            "voice_settings": _VOICE_SETTINGS,
+            **{name: value for name, value in context.items() if value},
+        },
+        sort_keys=True,
+    )
+    return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+
+
+def _open_pcm_wav(output_path: Path, sample_rate: int) -> wave.Wave_write:
+    """
+    Open a mono 16-bit WAV file for raw PCM chunks as they arrive.
+
+    The header sizes are filled in when the writer is closed.
+    """
+    wav = wave.open(str(output_path), "wb")
+    wav.setnchannels(1)
+    wav.setsampwidth(2)  # signed 16-bit little-endian, as ElevenLabs sends it
+    wav.setframerate(sample_rate)
+    return wav
 
 
 class VoiceClient:
@@ -62,7 +205,15 @@ class VoiceClient:
                 "Set ELEVENLABS_API_KEY environment variable."
             )
 
-        self.client = ElevenLabs(api_key=self.api_key)
+        # One pooled HTTP/2 connection for every request from this client,
+        # including generate_for_segments' worker threads, so repeated TTS
+        # calls reuse it instead of each paying a TLS handshake
+        self._http = httpx.Client(
+            http2=True,
+            timeout=240.0,  # the SDK's default request timeout
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=300),
+        )
+        self.client = ElevenLabs(api_key=self.api_key, httpx_client=self._http)
         # eleven_multilingual_v2 is "most lifelike and emotionally rich" - best for quality
         # eleven_turbo_v2_5 is 300% faster but lower quality
         self.model_id = "eleven_multilingual_v2"
@@ -71,6 +222,9 @@ class VoiceClient:
         self.output_format = "pcm_44100"
         self.sample_rate = 44100
 
+        # (fetched_at, voices) from the last list_voices call
+        self._voices_cache: Optional[tuple[float, list[dict]]] = None
+
     def clone_voice(
         self,
         name: str,
@@ -93,14 +247,19 @@ class VoiceClient:
             voice_id to use for generation
         """
         # Calculate total audio duration to determine best method
-        total_duration = 0.0
-        for path in audio_files:
+        def probe(path: str | Path) -> float:
             path = Path(path)
-            if path.exists():
-                try:
-                    total_duration += get_audio_duration(path)
-                except Exception as e:
-                    logger.warning(f"Could not get duration for {path}: {e}")
+            if not path.exists():
+                return 0.0
+            try:
+                return get_audio_duration(path)
+            except Exception as e:
+                logger.warning(f"Could not get duration for {path}: {e}")
+                return 0.0
+
+        # Each probe is an ffprobe subprocess, so run them side by side
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            total_duration = sum(pool.map(probe, audio_files))
 
         logger.info(f"Total audio duration: {total_duration:.1f}s")
 
@@ -124,11 +283,14 @@ class VoiceClient:
         try:
             for path in audio_files:
                 path = Path(path)
-                if not path.exists():
-                    raise FileNotFoundError(f"Audio file not found: {path}")
-                # Open file in binary mode for upload
-                file_handles.append(open(path, "rb"))
-                logger.info(f"Opened audio file: {path} ({path.stat().st_size} bytes)")
+                # Open file in binary mode for upload; the open doubles as
+                # the existence check and fstat reuses the descriptor
+                try:
+                    fh = open(path, "rb")
+                except FileNotFoundError:
+                    raise FileNotFoundError(f"Audio file not found: {path}") from None
+                file_handles.append(fh)
+                logger.info(f"Opened audio file: {path} ({os.fstat(fh.fileno()).st_size} bytes)")
 
             if method == "pvc":
                 # Professional Voice Cloning - highest quality (Pro plan required)
@@ -190,6 +352,8 @@ class VoiceClient:
             # Close all file handles
             for fh in file_handles:
                 fh.close()
+            # A new voice may exist now
+            self._voices_cache = None
 
     def clone_voice_pvc(
         self,
@@ -244,6 +408,7 @@ class VoiceClient:
         previous_text: Optional[str] = None,
         next_text: Optional[str] = None,
         previous_request_ids: Optional[list[str]] = None,
+        stream: bool = False,
     ) -> tuple[Path, Optional[str]]:
         """
         Generate speech from text with caching, context, and request stitching.
@@ -258,6 +423,9 @@ class VoiceClient:
             previous_request_ids: Request IDs from previous generations for audio-based
                                   prosody stitching. Max 3 IDs, must be < 2 hours old.
                                   If provided, previous_text is ignored (per ElevenLabs API).
+            stream: Use the streaming endpoint, which starts returning PCM
+                    while the rest is still being generated (lower time to
+                    first byte for interactive callers)
 
         Returns:
             Tuple of (path, request_id):
@@ -270,25 +438,56 @@ class VoiceClient:
             Text context (previous_text/next_text) is used as fallback when no prior
             request IDs are available.
         """
-        # Include context in cache key if provided (different context = different prosody)
-        cache_content = f"{voice_id}:{text}"
-        if previous_request_ids:
-            cache_content += f"|req_ids:{','.join(previous_request_ids)}"
-        elif previous_text:
-            cache_content += f"|prev:{previous_text}"
-        if next_text:
-            cache_content += f"|next:{next_text}"
-        cache_key = hashlib.sha256(cache_content.encode()).hexdigest()[:16]
+        path, request_id, _ = self._generate(
+            text, voice_id, output_path, use_cache,
+            previous_text, next_text, previous_request_ids, stream,
+        )
+        return path, request_id
+
+    def _generate(
+        self,
+        text: str,
+        voice_id: str,
+        output_path: Optional[Path],
+        use_cache: bool,
+        previous_text: Optional[str],
+        next_text: Optional[str],
+        previous_request_ids: Optional[list[str]],
+        stream: bool,
+    ) -> tuple[Path, Optional[str], float]:
+        """
+        Body of generate(), also returning the audio duration in seconds.
+
+        The duration comes from the cache entry or the number of PCM frames
+        written, so callers never need to ffprobe the file.
+        """
+        # Include context in cache key if provided (different context = different prosody);
+        # previous_text is ignored by ElevenLabs when request IDs are given
+        cache_key = _get_cache_key(
+            text,
+            voice_id,
+            self.model_id,
+            self.output_format,
+            previous_request_ids=previous_request_ids,
+            previous_text=None if previous_request_ids else previous_text,
+            next_text=next_text,
+        )
 
+        if use_cache:
+            _load_tts_index()
         if use_cache and cache_key in _tts_cache:
-            cached_path, _ = _tts_cache[cache_key]
+            cached_path, duration = _tts_cache[cache_key]
             if cached_path.exists():
                 logger.debug(f"TTS cache hit: '{text[:30]}...'")
+                with _tts_index_lock:
+                    _tts_index_hits[cache_key] = time.time()
                 if output_path:
-                    import shutil
-                    shutil.copy(cached_path, output_path)
-                    return output_path, None  # No request_id for cached results
-                return cached_path, None
+                    # Reflink where the filesystem allows (O(1), copy-on-write).
+                    # Not a hardlink: a later in-place write to output_path
+                    # (e.g. ffmpeg -y) would truncate the cache entry
+                    reflink_or_copy(cached_path, output_path)
+                    return output_path, None, duration  # No request_id for cached results
+                return cached_path, None, duration
 
         # Log context for debugging
         context_info = ""
@@ -306,13 +505,7 @@ class VoiceClient:
             "text": text,
             "voice_id": voice_id,
             "model_id": self.model_id,
-            "voice_settings": VoiceSettings(
-                # ElevenLabs recommended defaults for natural speech:
-                stability=0.5,  # 0.5 = balanced (lower=expressive, higher=monotone)
-                similarity_boost=0.75,  # 0.75 = good match without artifacts
-                style=0.0,  # MUST be 0 - any higher causes instability/artifacts
-                use_speaker_boost=True,  # Enhanced clarity
-            ),
+            "voice_settings": VoiceSettings(**_VOICE_SETTINGS),
             "output_format": self.output_format,  # 44.1kHz PCM (highest quality, Pro plan)
         }
 
@@ -327,34 +520,6 @@ class VoiceClient:
             if next_text:
                 api_params["next_text"] = next_text
 
-        # Generate audio - try to capture request_id from headers if possible
-        request_id = None
-        try:
-            # with_raw_response returns an iterator - we need to consume it
-            raw_response_iter = self.client.text_to_speech.with_raw_response.convert(**api_params)
-
-            # Consume the iterator to get audio bytes and try to get headers
-            audio_chunks = []
-            for chunk in raw_response_iter:
-                # chunk might be HttpResponse or bytes depending on SDK version
-                if hasattr(chunk, 'headers'):
-                    request_id = chunk.headers.get("x-request-id") or chunk.headers.get("request-id")
-                    if hasattr(chunk, 'data'):
-                        audio_chunks.extend(chunk.data)
-                    else:
-                        audio_chunks.append(chunk)
-                else:
-                    audio_chunks.append(chunk)
-
-            audio_bytes = b"".join(audio_chunks)
-            if request_id:
-                logger.debug(f"Captured request_id: {request_id}")
-        except Exception as e:
-            # Fallback to regular API call if with_raw_response fails
-            logger.warning(f"with_raw_response failed, falling back to regular call: {e}")
-            audio_generator = self.client.text_to_speech.convert(**api_params)
-            audio_bytes = b"".join(audio_generator)
-
         # Determine output path - use cache dir if caching
         if output_path is None:
             if use_cache:
@@ -365,35 +530,74 @@ class VoiceClient:
                 os.close(fd)
                 output_path = Path(output_path)
 
-        # Save raw PCM to temp file
-        with tempfile.NamedTemporaryFile(suffix=".pcm", delete=False) as f:
-            f.write(audio_bytes)
-            temp_pcm = Path(f.name)
-
-        # Convert raw PCM to WAV with proper headers
-        # Use 44.1kHz (highest quality from Pro plan)
-        from ..core.ffmpeg_utils import run_ffmpeg
-        run_ffmpeg([
-            "-f", "s16le",    # Input format: signed 16-bit little-endian
-            "-ar", str(self.sample_rate),  # Input sample rate: 44.1kHz from ElevenLabs Pro
-            "-ac", "1",       # Input channels: mono
-            "-i", str(temp_pcm),
-            "-acodec", "pcm_s16le",
-            "-ar", str(self.sample_rate),  # Output at native 44.1kHz (highest quality)
-            str(output_path),
-        ], "Convert PCM to WAV")
+        # PCM to WAV is only a RIFF header, so write it directly as the
+        # response arrives (44.1kHz, Pro plan) rather than through ffmpeg.
+        # It goes to a unique partial file first: concurrent calls for the
+        # same line share one cache path, and readers must never see half a file
+        fd, partial_path = tempfile.mkstemp(suffix=".part", dir=Path(output_path).parent)
+        os.close(fd)
+        partial_path = Path(partial_path)
+        wav = _open_pcm_wav(partial_path, self.sample_rate)
+        try:
+            # Generate audio - try to capture request_id from headers if possible
+            request_id = None
+            try:
+                request_id = self._stream_raw_response(api_params, wav.writeframesraw, stream)
+                if request_id:
+                    logger.debug(f"Captured request_id: {request_id}")
+            except Exception as e:
+                # Fallback to regular API call if with_raw_response fails;
+                # reopen the file so no partial audio is kept
+                logger.warning(f"with_raw_response failed, falling back to regular call: {e}")
+                wav.close()
+                wav = _open_pcm_wav(partial_path, self.sample_rate)
+                tts = self.client.text_to_speech
+                endpoint = tts.stream if stream else tts.convert
+                for chunk in endpoint(**api_params):
+                    wav.writeframesraw(chunk)
+        except BaseException:
+            wav.close()
+            partial_path.unlink(missing_ok=True)
+            raise
+        # Mono 16-bit, so frames written is the sample count
+        duration = wav.getnframes() / self.sample_rate
+        wav.close()
+        os.replace(partial_path, output_path)
 
         # Cache the result
         if use_cache:
-            duration = get_audio_duration(output_path)
             _tts_cache[cache_key] = (output_path, duration)
+            # Only files the cache owns are persisted (and may be evicted)
+            if Path(output_path).parent == _get_tts_cache_dir():
+                _store_tts_index(cache_key, Path(output_path), duration)
             logger.debug(f"TTS cached: '{text[:30]}...' ({duration:.2f}s)")
 
-        # Clean up temp PCM
-        temp_pcm.unlink()
-
         logger.debug(f"Generated audio: {output_path}, request_id: {request_id}")
-        return output_path, request_id
+        return output_path, request_id, duration
+
+    def _stream_raw_response(self, api_params: dict, write, stream: bool = False) -> Optional[str]:
+        """
+        Stream TTS audio through with_raw_response, passing each chunk to write.
+
+        Uses the streaming endpoint when stream is set, otherwise convert.
+        Returns the request ID from the response headers, if any.
+        """
+        raw = self.client.text_to_speech.with_raw_response
+        endpoint = raw.stream if stream else raw.convert
+        request_id = None
+        # with_raw_response returns an iterator - we need to consume it
+        for chunk in endpoint(**api_params):
+            # chunk might be HttpResponse or bytes depending on SDK version
+            if hasattr(chunk, 'headers'):
+                request_id = chunk.headers.get("x-request-id") or chunk.headers.get("request-id")
+                if hasattr(chunk, 'data'):
+                    for data in chunk.data:
+                        write(data)
+                else:
+                    write(chunk)
+            else:
+                write(chunk)
+        return request_id
 
     def generate_for_segment(
         self,
@@ -419,14 +623,22 @@ class VoiceClient:
         """
         logger.info(f"Generating speech for {target_duration:.2f}s segment: '{text}'")
 
-        # Generate raw audio
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            raw_audio = Path(f.name)
-
-        _, _ = self.generate(text, voice_id, raw_audio)  # Ignore returned path & request_id
+        # Generate raw audio into the TTS cache and stretch straight from
+        # there - no scratch file, and repeated lines are cache hits
+        raw_audio, _, raw_duration = self._generate(
+            text, voice_id, output_path=None, use_cache=True,
+            previous_text=None, next_text=None, previous_request_ids=None, stream=False,
+        )  # Ignore request_id
+        return self._stretch_to(raw_audio, raw_duration, target_duration, output_path)
 
-        # Check duration
-        raw_duration = get_audio_duration(raw_audio)
+    def _stretch_to(
+        self,
+        raw_audio: Path,
+        raw_duration: float,
+        target_duration: float,
+        output_path: Optional[Path],
+    ) -> Path:
+        """Time-stretch generated audio to target_duration (ffmpeg half of generate_for_segment)."""
         logger.debug(f"Raw audio duration: {raw_duration:.2f}s, target: {target_duration:.2f}s")
 
         # Prepare output path
@@ -440,24 +652,89 @@ class VoiceClient:
             audio_path=raw_audio,
             target_duration=target_duration,
             output_path=output_path,
+            current_duration=raw_duration,
         )
 
-        # Clean up
-        raw_audio.unlink()
+        # The stretch is cut with -t, so the output length is the target
+        # (or within 50ms of it when the raw audio was copied as-is)
+        logger.info(f"Generated audio: {target_duration:.2f}s (raw: {raw_duration:.2f}s)")
+
+        return output_path
+
+    async def generate_for_segments(
+        self,
+        segments: list[tuple[str, float]],
+        voice_id: str,
+        output_paths: Optional[list[Path]] = None,
+        concurrency: int = 8,
+    ) -> list[Path]:
+        """
+        Async variant of generate_for_segment for many independent segments.
+
+        Each segment's TTS request runs on a worker thread, with at most
+        `concurrency` in flight to stay inside ElevenLabs rate limits, so
+        total time is close to the slowest batch rather than the sum of all
+        segments. Time-stretches are ffmpeg subprocesses, so they run on a
+        shared module-level pool sized to the CPU count and never hold an API
+        slot.
+
+        Args:
+            segments: (text, target_duration) for each segment
+            voice_id: ElevenLabs voice ID
+            output_paths: Where to save each segment (optional, temp files)
+            concurrency: Maximum number of segments generated at once
+
+        Returns:
+            Paths to audio files, in the same order as segments
+        """
+        if output_paths is None:
+            output_paths = [None] * len(segments)
+        elif len(output_paths) != len(segments):
+            raise ValueError("output_paths must have one entry per segment")
+
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+
+        async def generate_one(
+            text: str,
+            target_duration: float,
+            output_path: Optional[Path],
+        ) -> Path:
+            logger.info(f"Generating speech for {target_duration:.2f}s segment: '{text}'")
+            async with semaphore:
+                raw_audio, _, raw_duration = await asyncio.to_thread(
+                    self._generate, text, voice_id, output_path=None, use_cache=True,
+                    previous_text=None, next_text=None, previous_request_ids=None, stream=False,
+                )
+            return await loop.run_in_executor(
+                _stretch_pool, self._stretch_to, raw_audio, raw_duration, target_duration, output_path
+            )
 
-        # Verify final duration
-        final_duration = get_audio_duration(output_path)
-        logger.info(
-            f"Generated audio: {final_duration:.2f}s "
-            f"(target: {target_duration:.2f}s, diff: {abs(final_duration - target_duration)*1000:.1f}ms)"
+        logger.info(f"Generating {len(segments)} segments ({concurrency} in flight)")
+
+        # gather preserves input order
+        paths = await asyncio.gather(
+            *(
+                generate_one(text, target_duration, output_path)
+                for (text, target_duration), output_path in zip(segments, output_paths)
+            )
         )
+        return list(paths)
 
-        return output_path
+    def list_voices(self, refresh: bool = False) -> list[dict]:
+        """
+        List all available voices including clones.
+
+        The response is reused for a minute, so repeated lookups don't each
+        make a round trip to ElevenLabs; pass refresh=True to force one.
+        """
+        if not refresh and self._voices_cache is not None:
+            fetched_at, voices = self._voices_cache
+            if time.monotonic() - fetched_at < _VOICES_CACHE_TTL:
+                return voices
 
-    def list_voices(self) -> list[dict]:
-        """List all available voices including clones."""
         response = self.client.voices.get_all()
-        return [
+        voices = [
             {
                 "id": v.voice_id,
                 "name": v.name,
@@ -465,25 +742,60 @@ class VoiceClient:
             }
             for v in response.voices
         ]
+        self._voices_cache = (time.monotonic(), voices)
+        return voices
+
+    def find_voice(self, name: str) -> Optional[dict]:
+        """Find a voice by name (case-insensitive), or None if there isn't one."""
+        name = name.casefold()
+        for voice in self.list_voices():
+            if voice["name"] and voice["name"].casefold() == name:
+                return voice
+        return None
 
     def delete_voice(self, voice_id: str):
         """Delete a cloned voice."""
         self.client.voices.delete(voice_id)
+        self._voices_cache = None
         logger.info(f"Deleted voice: {voice_id}")
 
 
 # Module-level convenience functions
 _client: Optional[VoiceClient] = None
+_client_lock = threading.Lock()
 
 
 def get_voice_client() -> VoiceClient:
     """Get or create the voice client singleton."""
     global _client
-    if _client is None:
-        _client = VoiceClient()
+    with _client_lock:
+        if _client is None:
+            _client = VoiceClient()
     return _client
 
 
+def prewarm() -> Optional[threading.Thread]:
+    """
+    Create the voice client and open its ElevenLabs connection in the background.
+
+    The first real request then reuses a warm HTTP/2 connection instead of
+    paying DNS + TLS setup. Does nothing if no API key is configured.
+    """
+    if not os.getenv("ELEVENLABS_API_KEY"):
+        return None
+
+    def warm():
+        try:
+            # Cheap authenticated call; also fills the voices cache
+            get_voice_client().list_voices()
+        except Exception as e:
+            logger.debug(f"Voice client prewarm failed: {e}")
+
+    thread = threading.Thread(target=warm, name="voice-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
 def generate_for_segment(
     text: str,
     voice_id: str,